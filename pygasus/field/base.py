@@ -29,6 +29,7 @@
 
 """Field dynamic decorator to wrap pydantic.ModelField."""
 
+from sys import intern
 from typing import Any, TYPE_CHECKING
 
 from pydantic.main import ModelField
@@ -44,8 +45,12 @@ class PygasusField:
 
     def __init__(self, field: ModelField):
         self.__field__ = field
+        # Read for every query, skip __getattr__.  Interned, as it is
+        # used as a key in column collections.
+        self.name = intern(field.name)
         self.__model__ = None
         self.__storage__ = None
+        self.__column__ = None  # Set by the SQL storage engine.
 
     def __getattr__(self, key):
         if key.startswith("__") and key.endswith("__"):
@@ -81,7 +81,6 @@ from pydantic import BaseModel, Field, PrivateAttr  # noqa: F401
 from pydantic.main import ModelMetaclass
 
 from pygasus.field.base import PygasusField
-from pygasus.model.collections import Sequence
 from pygasus.model.decorators import LazyPropertyDescriptor, lazy_property
 from pygasus.model.helpers import get_primary_keys
 from pygasus.model.repository import Repository
@@ -96,6 +95,19 @@ class MetaModel(ModelMetaclass):
     def __new__(cls, name, bases, attrs):
         cls = super().__new__(cls, name, bases, attrs)
         cls.__pygasus__ = {}
+        cls.__model_name__ = getattr(
+            cls.__config__, "model_name", cls.__name__.lower()
+        )
+        cls.__primary_keys__ = tuple(
+            name
+            for name, field in cls.__fields__.items()
+            if field.field_info.extra.get("primary_key", False)
+        )
+        cls.__sequences__ = frozenset(
+            name
+            for name, field in cls.__fields__.items()
+            if field.field_info.extra.get("sequence", False)
+        )
         if cls.__name__ != "Model":
             MODELS.add(cls)
 
@@ -125,6 +137,9 @@ class Model(BaseModel, metaclass=MetaModel):
 
     """Abstract class for all models."""
 
+    # Allow weak references, used by the storage engine's identity cache.
+    __slots__ = ("__weakref__",)
+
     _exists = PrivateAttr()
 
     class Config:
@@ -143,20 +158,9 @@ class Model(BaseModel, metaclass=MetaModel):
     def __getattribute__(self, attr: str) -> Any:
         """Get the attribute doing a storage query if necessary."""
         value = object.__getattribute__(self, attr)
-        if attr.startswith("_") or not self._exists:
-            return value
-
-        field = self.__fields__.get(attr)
-        if field is not None:
-            o_type = field.outer_type_
-            f_type = field.type_
-            if (
-                isinstance(f_type, type)
-                and issubclass(f_type, Model)
-                and o_type is Sequence[f_type]
-            ):
-                # This object has several related, query the storage if needed.
-                value.load_from_storage()
+        if attr in type(self).__sequences__ and self._exists:
+            # This object has several related, query the storage if needed.
+            value.load_from_storage()
         return value
 
     def __repr_args__(self):
@@ -170,6 +174,11 @@ class Model(BaseModel, metaclass=MetaModel):
 
     def __setattr__(self, key: str, value: Any):
         """Force an UPDATE operation on the storage."""
+        if key in self.__private_attributes__:
+            # Private attributes are never stored, set them directly.
+            object.__setattr__(self, key, value)
+            return
+
         old_value = getattr(self, key, ...)
         exists = getattr(self, "_exists", False)
         cls_attr = getattr(type(self), key, None)
@@ -185,10 +194,26 @@ class Model(BaseModel, metaclass=MetaModel):
         super().__setattr__(key, value)
 
     def __eq__(self, other):
-        """Don't compare dict like Pydantic does, just compare field values."""
+        """Don't compare dict like Pydantic does, just compare field values.
+
+        Models with primary keys are equal if their primary keys are.
+
+        """
+        if self is other:
+            return True
+
         if not isinstance(other, type(self)):
             return False
 
+        primary_keys = type(self).__primary_keys__
+        if primary_keys:
+            fields1 = self.__dict__
+            fields2 = other.__dict__
+            return all(
+                fields1.get(name, ...) == fields2.get(name, ...)
+                for name in primary_keys
+            )
+
         common = True
         for name, field in self.__fields__.items():
             value1 = getattr(self, name, ...)
@@ -205,6 +230,15 @@ class Model(BaseModel, metaclass=MetaModel):
 
         return common
 
+    def __hash__(self):
+        """Hash models with primary keys on these keys."""
+        primary_keys = type(self).__primary_keys__
+        if not primary_keys:
+            raise TypeError(f"unhashable model: {type(self).__name__!r}")
+
+        fields = self.__dict__
+        return hash((type(self), *(fields.get(name) for name in primary_keys)))
+
     def __reduce__(self):
         return (retrieve, (type(self), get_primary_keys(self)))
 
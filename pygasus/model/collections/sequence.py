@@ -30,7 +30,8 @@
 """Module containing Sequence to host a list (or set) or data (or models)."""
 
 from collections.abc import MutableSequence
-from typing import Any, Generic, List, TypeVar
+from itertools import islice
+from typing import Any, Dict, Generic, Iterable, List, Tuple, TypeVar
 
 from pydantic import PrivateAttr
 from pydantic.generics import GenericModel
@@ -39,6 +40,32 @@ from pygasus.model.helpers import get_primary_keys
 
 model = TypeVar("model")
 
+# Number of models shown when representing a sequence.
+REPR_LIMIT = 10
+
+
+def _identify(model: Any) -> Tuple[Any, ...]:
+    """Return the key identifying a model in a sequence.
+
+    Models are identified by their class and primary keys, so that
+    a model read again from the storage (after the cache has been
+    cleared, for instance) matches the one in the sequence.
+
+    Args:
+        model (Model): the model to identify.
+
+    Returns:
+        key (tuple): the model class and primary key values, or
+                the model identity if it has no primary key.
+
+    """
+    names = getattr(type(model), "__primary_keys__", ())
+    if not names:
+        return (id(model),)
+
+    fields = model.__dict__
+    return (type(model), *(fields.get(name) for name in names))
+
 
 class Sequence(GenericModel, MutableSequence, Generic[model]):
 
@@ -56,52 +83,66 @@ class Sequence(GenericModel, MutableSequence, Generic[model]):
     right_field: Any
     parent: Any = None
     _loaded = PrivateAttr()
+    _ids = PrivateAttr()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._loaded = False
 
+        # Keys of the contained models, for membership tests.
+        self._ids = set(map(_identify, self.models))
+
     def __contains__(self, model):
         self.load_from_storage()
-        return any(model == contained for contained in self.models)
+        return _identify(model) in self._ids
 
     def __getitem__(self, index: int) -> model:
         return self.models[index]
 
     def __setitem__(self, index: int, value: model) -> None:
         self.models[index] = value
+        self._ids = set(map(_identify, self.models))
 
     def __delitem__(self, index: int) -> None:
         del self.models[index]
+        self._ids = set(map(_identify, self.models))
 
     def __len__(self) -> int:
         return len(self.models)
 
     def __repr__(self) -> str:
-        sequence = []
-        for element in self.models:
-            representation = "<"
-            representation += type(element).__name__
-            representation += "("
-            fields = []
-            for name, value in get_primary_keys(element).items():
-                fields.append(f"{name}={value!r}")
-            representation += ", ".join(fields)
-            representation += ")>"
-            sequence.append(representation)
-        return f"[{', '.join(sequence)}]"
+        return self._represent("<{}>")
 
     def __str__(self) -> str:
+        return self._represent("{}")
+
+    def _represent(self, pattern: str) -> str:
+        """Represent the first models of the sequence.
+
+        Only the first `REPR_LIMIT` models are shown, so that logging
+        a large sequence doesn't represent every model in it.
+
+        Args:
+            pattern (str): the format of a model representation,
+                    `{}` being replaced by its name and primary keys.
+
+        Returns:
+            representation (str): the sequence representation.
+
+        """
         sequence = []
-        for element in self.models:
-            representation = type(element).__name__
-            representation += "("
-            fields = []
-            for name, value in get_primary_keys(element).items():
-                fields.append(f"{name}={value!r}")
-            representation += ", ".join(fields)
-            representation += ")"
-            sequence.append(representation)
+        for element in islice(self.models, REPR_LIMIT):
+            fields = ", ".join(
+                f"{name}={value!r}"
+                for name, value in get_primary_keys(element).items()
+            )
+            sequence.append(
+                pattern.format(f"{type(element).__name__}({fields})")
+            )
+
+        hidden = len(self.models) - REPR_LIMIT
+        if hidden > 0:
+            sequence.append(f"... ({hidden} more)")
         return f"[{', '.join(sequence)}]"
 
     def __eq__(self, other):
@@ -129,9 +170,9 @@ class Sequence(GenericModel, MutableSequence, Generic[model]):
         instance._exists = True
 
         if old_sequence:
-            old_sequence.models.remove(instance)
+            old_sequence._discard(instance)
 
-        self.models.insert(index, instance)
+        self._insert(index, instance)
 
     def append(self, instance: model) -> None:
         old_parent = getattr(instance, self.right_field.name, None)
@@ -143,9 +184,9 @@ class Sequence(GenericModel, MutableSequence, Generic[model]):
         instance._exists = True
 
         if old_sequence:
-            old_sequence.models.remove(instance)
+            old_sequence._discard(instance)
 
-        self.models.append(instance)
+        self._insert(len(self.models), instance)
 
     def remove(self, instance: model) -> None:
         if self.right_field.required:
@@ -158,7 +199,7 @@ class Sequence(GenericModel, MutableSequence, Generic[model]):
         old_parent = getattr(instance, self.right_field.name, None)
         old_sequence = getattr(old_parent, self.left_field.name, None)
         if old_sequence:
-            old_sequence.models.remove(instance)
+            old_sequence._discard(instance)
 
         setattr(instance, self.right_field.name, None)
 
@@ -175,9 +216,55 @@ class Sequence(GenericModel, MutableSequence, Generic[model]):
         """
         kwargs[self.right_field.name] = self.parent
         obj = self.right_model.repository.insert_at(len(self), **kwargs)
-        self.models.append(obj)
+        self._insert(len(self.models), obj)
         return obj
 
+    def extend_new(self, rows: Iterable[Dict[str, Any]]) -> List[model]:
+        """Append several new model objects to the list.
+
+        Args:
+            rows (iterable of dict): the keyword arguments of each
+                    new model, created at once using the model's
+                    repository.
+
+        Returns:
+            models (list of model instances): the appended models.
+
+        """
+        name = self.right_field.name
+        rows = [dict(row, **{name: self.parent}) for row in rows]
+        objs = self.right_model.repository.insert_many_at(len(self), rows)
+        self.models.extend(objs)
+        self._ids.update(map(_identify, objs))
+        return objs
+
+    def insert_many_new(
+        self, index: int, rows: Iterable[Dict[str, Any]]
+    ) -> List[model]:
+        """Insert several new model objects in the list.
+
+        Args:
+            index (int): the index at which to insert the first object.
+                    Other objects follow it, in order.
+            rows (iterable of dict): the keyword arguments of each
+                    new model, created at once using the model's
+                    repository.
+
+        Returns:
+            models (list of model instances): the inserted models.
+
+        """
+        if index < 0:
+            index = max(len(self) + index, 0)
+        index = min(index, len(self))
+
+        name = self.right_field.name
+        rows = [dict(row, **{name: self.parent}) for row in rows]
+        objs = self.right_model.repository.insert_many_at(index, rows)
+        self.models[index:index] = objs
+        self._ids.update(map(_identify, objs))
+        return objs
+
     def insert_new(self, *args, **kwargs) -> model:
         """Insert a new model object to the list.
 
@@ -196,7 +283,7 @@ class Sequence(GenericModel, MutableSequence, Generic[model]):
         index = args[0]
         kwargs[self.right_field.name] = self.parent
         obj = self.right_model.repository.insert_at(index, **kwargs)
-        self.models.insert(index, obj)
+        self._insert(index, obj)
         return obj
 
     def load_from_storage(self):
@@ -205,9 +292,29 @@ class Sequence(GenericModel, MutableSequence, Generic[model]):
             return
 
         engine = self.right_model.repository.storage_engine
-        self.models[:] = engine.get_related(self)
+        self.set_loaded(engine.get_related(self))
+
+    def set_loaded(self, models: List[model]):
+        """Replace the sequence content by models read from storage.
+
+        Args:
+            models (list): the models in the sequence, in order.
+
+        """
+        self.models[:] = models
+        self._ids = set(map(_identify, models))
         self._loaded = True
 
+    def _insert(self, index: int, instance: model):
+        """Insert a model in the list, without storage operation."""
+        self.models.insert(index, instance)
+        self._ids.add(_identify(instance))
+
+    def _discard(self, instance: model):
+        """Remove a model from the list, without storage operation."""
+        self.models.remove(instance)
+        self._ids.discard(_identify(instance))
+
     class Config:
         underscore_attrs_are_private = True
         copy_on_model_validation = False
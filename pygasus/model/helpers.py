@@ -35,6 +35,23 @@ if TYPE_CHECKING:
     from pygasus.model.base import Model  # pragma: no cover
 
 
+def get_model_name(model: Type["Model"]) -> str:
+    """Return the model's name, used to name its collection in storage.
+
+    The name is the `model_name` configuration variable if set,
+    or the lowercase class name.  It is resolved once, when the class
+    is created, and stored in `__model_name__`.
+
+    Args:
+        model (subclass of Model): the class.
+
+    Returns:
+        name (str): the model name.
+
+    """
+    return model.__model_name__
+
+
 def get_model_qualname(model: Type["Model"]) -> str:
     """Return the model's qualname with its module.
 
@@ -58,6 +58,29 @@ class Repository:
         """
         return self.storage_engine.insert(self.model, data)
 
+    def create_many(self, rows):
+        """Create several objects at once.
+
+        This is much faster than calling `create` in a loop,
+        as rows are sent to the database together.  Either all
+        objects are created, or none of them is.
+
+        Args:
+            rows (list of dict): the fields of each object to create.
+
+        Returns:
+            objects (list of Model): the created objects, in order.
+
+        Example:
+
+            accounts = repository.create_many([
+                dict(username="me", ...),
+                dict(username="you", ...),
+            ])
+
+        """
+        return self.storage_engine.insert_many(self.model, list(rows))
+
     def place_at(self, sequence, instance, index):
         """Place the model at this location in a collection.
 
@@ -90,18 +113,54 @@ class Repository:
         index = args[0]
         return self.storage_engine.insert_at(self.model, data, index)
 
-    def select(self, query):
+    def insert_many_at(self, index, rows):
+        """Create several objects at a given index.
+
+        Args:
+            index (int): the index at which to place the first object.
+            rows (list of dict): the fields of each object to create.
+
+        Returns:
+            objects (list of Model): the created objects, in order.
+
+        """
+        return self.storage_engine.insert_many(self.model, list(rows), index)
+
+    def select(self, query, load=()):
         """Retrieve model instances based on a query.
 
         Args:
             The data to be sent to the database.
             query: the query to filter models.
+            load (iterable of str, optional): the names of sequences
+                    to load for all instances at once, rather than
+                    one query per instance when they're accessed.
 
         Examle:
             account = repository.select(Account.username == "me")
+            authors = repository.select(Author.born_in > 1800,
+                    load=("books",))
 
         """
-        return self.storage_engine.select(self.model, query)
+        return self.storage_engine.select(self.model, query, load=load)
+
+    def select_iter(self, query, load=()):
+        """Iterate over model instances matching a query.
+
+        Unlike `select`, instances are built as the loop goes,
+        which keeps memory low on large result sets.
+
+        Args:
+            query: the query to filter models.
+            load (iterable of str, optional): the names of sequences
+                    to load for each batch of instances at once.
+
+        Example:
+            for account in repository.select_iter(Account.age > 18):
+                ...
+
+        """
+        return self.storage_engine.select_iter(self.model, query, load=load)
 
     def get(self, **data):
         """Retrieve a model instance.
@@ -119,6 +178,23 @@ class Repository:
         """
         return self.storage_engine.get(self.model, **data)
 
+    def get_many(self, pks):
+        """Retrieve several model instances from their primary keys.
+
+        Args:
+            pks (list): the primary key of each instance, as a tuple
+                    if the model has several primary keys.
+
+        Returns:
+            instances (list): the instances in the order of `pks`,
+                    None for the ones that don't exist.
+
+        Example:
+            first, second = repository.get_many([1, 2])
+
+        """
+        return self.storage_engine.get_many(self.model, list(pks))
+
     def update(self, instance, key, old_value, new_value):
         """Inform of an update."""
         self.storage_engine.update(
@@ -129,6 +205,23 @@ class Repository:
             new_value,
         )
 
+    def update_fields(self, instance, **values):
+        """Update several fields of an instance at once.
+
+        Setting attributes one by one sends one query per attribute.
+        This method sends a single query for all of them.
+
+        Args:
+            instance (Model): a model instance.
+            Keyword arguments contain the new value of each field.
+
+        Example:
+
+            repository.update_fields(account, username="you", age=21)
+
+        """
+        self.storage_engine.update_fields(self.model, instance, values)
+
     def delete(self, instance):
         """Delete the specified instance.
 
@@ -30,11 +30,14 @@
 """Module containing the abstract class for storage engines."""
 
 from abc import ABCMeta, abstractmethod
-from typing import Any, Dict, List, Optional, Set, Type
+from typing import Any, Callable, Dict, List, Optional, Set, Type
+from weakref import WeakValueDictionary
 
 from pygasus.model import CustomField, Field, Model, Sequence
 from pygasus.storage.query_builder import AbstractQueryBuilder
 
+Converter = Callable[[Type[Model], Field, Any], Any]
+
 
 class AbstractStorageEngine(metaclass=ABCMeta):
 
@@ -45,6 +48,12 @@ class AbstractStorageEngine(metaclass=ABCMeta):
     a database).  The implementation of such a storage engine
     depends on the storage system being used.
 
+    Model instances are kept in an identity cache, so that the same
+    row is always represented by the same object.  The cache only
+    holds weak references: an instance stays cached as long as
+    something else (the caller, another instance, a sequence)
+    references it, and is forgotten once it is garbage-collected.
+
     """
 
     query_builder: AbstractQueryBuilder = None
@@ -52,7 +61,9 @@ class AbstractStorageEngine(metaclass=ABCMeta):
     def __init__(self):
         self.models = {}
         self.custom_fields = {}
-        self.cache = {}
+        self.cache = WeakValueDictionary()
+        self.to_storage_converters = {}
+        self.from_storage_converters = {}
 
     def add_custom_field(self, field: Type[CustomField], **kwargs):
         """Add support for a custom field.
@@ -65,6 +76,34 @@ class AbstractStorageEngine(metaclass=ABCMeta):
 
         """
 
+    def add_converter(
+        self,
+        field_type: type,
+        to_storage: Optional[Converter] = None,
+        from_storage: Optional[Converter] = None,
+    ):
+        """Add converters for a field type.
+
+        Converters are looked up by the exact type of the field
+        (or value) to convert, not by name, so that two classes
+        sharing the same name don't collide.  Both converters
+        are called with the model class, the field and the value
+        to convert, and should return the converted value.
+
+        Args:
+            field_type (type): the type to convert.
+            to_storage (callable, optional): the converter to use
+                    when storing a value of this type.
+            from_storage (callable, optional): the converter to use
+                    when reading a value of this type from the storage.
+
+        """
+        if to_storage is not None:
+            self.to_storage_converters[field_type] = to_storage
+
+        if from_storage is not None:
+            self.from_storage_converters[field_type] = from_storage
+
     def add_custom_field_to_model(
         self,
         custom_field: Type[CustomField],
@@ -110,6 +149,10 @@ class AbstractStorageEngine(metaclass=ABCMeta):
     def destroy(self):
         """Close and destroy the storage engine."""
 
+    @abstractmethod
+    def truncate(self):
+        """Remove all stored rows, keeping bound models."""
+
     def bind(self, models: Optional[Set[Type[Model]]] = None):
         """Bind the speicifed models to this controller.
 
@@ -156,6 +199,26 @@ class AbstractStorageEngine(metaclass=ABCMeta):
 
         """
 
+    @abstractmethod
+    def insert_many(
+        self,
+        model: Type[Model],
+        rows: List[Dict[str, Any]],
+        index: Optional[int] = None,
+    ) -> List[Model]:
+        """Add several new rows for this model at once.
+
+        Args:
+            model (subclass of Model): the model class.
+            rows (list of dict): the attributes of each new object.
+            index (int, optional): if set, the index at which to
+                    place the new objects in their sequence.
+
+        Returns:
+            objs (list of Model): the new objects, in order.
+
+        """
+
     @abstractmethod
     def get(self, model: Type[Model], **kwargs):
         """Get a model instance with the specified arguments.
@@ -179,6 +242,23 @@ class AbstractStorageEngine(metaclass=ABCMeta):
 
         """
 
+    @abstractmethod
+    def get_many(
+        self, model: Type[Model], pks: List[Any]
+    ) -> List[Optional[Model]]:
+        """Get several model instances from their primary keys.
+
+        Args:
+            model (subclass of Model): the model object.
+            pks (list): the primary key of each instance to retrieve,
+                    as a tuple if the model has several primary keys.
+
+        Returns:
+            instances (list of Model): the model instances, in the
+                    order of `pks`, None for the ones not found.
+
+        """
+
     @abstractmethod
     def get_related(self, sequence: Sequence) -> List[Model]:
         """Retrieve the related objects from a collection.
@@ -208,6 +288,19 @@ class AbstractStorageEngine(metaclass=ABCMeta):
 
         """
 
+    @abstractmethod
+    def update_fields(
+        self, model: Type[Model], instance: Model, values: Dict[str, Any]
+    ):
+        """Update several attributes of an instance at once.
+
+        Args:
+            model (subclass of Model): the model class.
+            instance (Model): the model object.
+            values (dict): the new value of each attribute to modify.
+
+        """
+
     @abstractmethod
     def delete(self, model: Type[Model], instance: Model):
         """Delete the specified model.
@@ -287,11 +380,7 @@ class AbstractStorageEngine(metaclass=ABCMeta):
                 value = getattr(instance, name, ...)
                 if value is not ...:
                     o_type = field.outer_type_
-                    method = getattr(
-                        self,
-                        f"{o_type.__name__.lower()}_to_storage",
-                        None,
-                    )
+                    method = self.to_storage_converters.get(o_type)
                     if method:
                         value = method(type(instance), field, value)
 
@@ -301,7 +390,7 @@ class AbstractStorageEngine(metaclass=ABCMeta):
                         uniques[name] = value
 
         # Cache primary key fields directly.
-        self.cache[(type(instance),) + tuple(pks)] = instance
+        self.cache[(type(instance), *pks)] = instance
 
         # Cache unique indexes.
         for key, value in uniques.items():
@@ -332,11 +421,7 @@ class AbstractStorageEngine(metaclass=ABCMeta):
                 value = attributes.get(name, ...)
                 if value is not ...:
                     o_type = field.outer_type_
-                    method = getattr(
-                        self,
-                        f"{o_type.__name__.lower()}_to_storage",
-                        None,
-                    )
+                    method = self.to_storage_converters.get(o_type)
                     if method:
                         value = method(model, field, value)
 
@@ -347,7 +432,7 @@ class AbstractStorageEngine(metaclass=ABCMeta):
 
         # If PKs, retrieve them.
         if pks:
-            return self.cache.get((model,) + tuple(pks))
+            return self.cache.get((model, *pks))
 
         # Or retrieve from uniques.
         for key, value in uniques.items():
@@ -374,11 +459,7 @@ class AbstractStorageEngine(metaclass=ABCMeta):
                 value = getattr(instance, name, ...)
                 if value is not ...:
                     o_type = field.outer_type_
-                    method = getattr(
-                        self,
-                        f"{o_type.__name__.lower()}_to_storage",
-                        None,
-                    )
+                    method = self.to_storage_converters.get(o_type)
                     if method:
                         value = method(type(instance), field, value)
 
@@ -388,7 +469,7 @@ class AbstractStorageEngine(metaclass=ABCMeta):
                         uniques[name] = value
 
         # Remove primary key fields.
-        self.cache.pop((type(instance),) + tuple(pks), None)
+        self.cache.pop((type(instance), *pks), None)
 
         # Remove unique indexes.
         for key, value in uniques.items():
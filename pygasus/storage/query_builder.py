@@ -60,6 +60,8 @@ class AbstractQueryBuilder(metaclass=ABCMeta):
 
     """
 
+    __slots__ = ("storage_engine",)
+
     def __init__(self, storage_engine):
         self.storage_engine = storage_engine
 
@@ -31,11 +31,24 @@
 
 from datetime import date, datetime
 import enum
-from functools import reduce
-from itertools import count
+from functools import partial, reduce
+from itertools import count, groupby
+from logging import DEBUG, getLogger
 import operator
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 from uuid import UUID
 
 
@@ -61,14 +74,27 @@ from sqlalchemy import (
     Text,
     create_engine,
     event,
+    func,
+    select,
 )
-from sqlalchemy.sql import select
+from sqlalchemy.pool import StaticPool
 
 from pygasus.field.helpers import update_pygasus_field
 from pygasus.model import Field, Model, Sequence
+from pygasus.model.helpers import get_model_name
 from pygasus.storage.abc import AbstractStorageEngine
+from pygasus.storage.sql.meta import (
+    CUSTOM,
+    ENUM,
+    RELATION,
+    SCALAR,
+    SEQUENCE,
+    ModelMeta,
+)
 from pygasus.storage.sql.query_builder import SQLQueryBuilder
 
+logger = getLogger("pygasus.sql")
+
 SQL_TYPES = {
     bool: Boolean,
     bytes: LargeBinary,
@@ -81,6 +107,20 @@ SQL_TYPES = {
     EmailStr: Text,
 }
 
+# Pragmas applied to file databases, trading durability on OS crash
+# (not on process crash) for much faster writes.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# Maximum number of primary keys selected at once by `get_many`,
+# below the number of variables older SQLite versions accept.
+GET_MANY_BATCH = 500
+
 
 class SQLStorageEngine(AbstractStorageEngine):
 
@@ -95,10 +135,21 @@ class SQLStorageEngine(AbstractStorageEngine):
         self.query_builder = SQLQueryBuilder(self)
         self.file_name = None
         self.memory = False
+        self.engine = None
+        self._logging = False
+        self._log_listener = self._log_query
         self.tables = {}
         self.uniques = {}
         self.futures = set()
         self.relations = count(1)
+        self.row_plans = {}
+        self.hydrators = {}
+        self.metas = {}
+        self.add_converter(
+            UUID,
+            to_storage=self.uuid_to_storage,
+            from_storage=self.uuid_from_storage,
+        )
 
     def init(
         self,
@@ -116,12 +167,14 @@ class SQLStorageEngine(AbstractStorageEngine):
                     the `memory` argument to `True`.
             memory (bool): whether to store this database in memory or
                     not?  If `True`, the file name is ignored.
-            logging (bool): if True (the default), log SQL queries.
+            logging (bool or callable): if True (the default), log
+                    SQL queries at the DEBUG level of the `pygasus.sql`
+                    logger.  A callable can also be given, it will
+                    receive the statement and its parameters.
 
         """
         self.file_name = file_name if not memory else None
         self.memory = memory
-        self.logging = logging
 
         # Connect to the database.
         if memory:
@@ -136,26 +189,74 @@ class SQLStorageEngine(AbstractStorageEngine):
             else:
                 sql_file_name = str(file_name.resolve())
             self.file_name = file_name
-        self.engine = create_engine(f"sqlite:///{sql_file_name}")
+        # Keep the compiled form of every statement the engine uses
+        # (a few per bound model) and share the in-memory database
+        # between connections.
+        self.engine = create_engine(
+            f"sqlite:///{sql_file_name}",
+            query_cache_size=1200,
+            echo=False,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool if memory else None,
+        )
 
         # Add a function to override lower, as it only supports
-        # ASCII in sqlite3.
+        # ASCII in sqlite3.  Tune file databases for writing.
         @event.listens_for(self.engine, "connect")
         def setup_lower(dbapi_connection, conn_rec):
             dbapi_connection.create_function("pylower", 1, str.lower)
+            if not memory:
+                cursor = dbapi_connection.cursor()
+                for pragma in SQLITE_PRAGMAS:
+                    cursor.execute(pragma)
+                cursor.close()
 
         # Intercept requests to log them, if set.
-        @event.listens_for(self.engine, "before_cursor_execute")
-        def log_query(conn, cr, statement, parameters, *_):
-            log = self.logging
-            log = log if callable(log) else print
-            if self.logging:
-                log(statement.strip(), parameters)
-
+        self.logging = logging
         self.connection = self.engine.connect()
         self.metadata = MetaData()
         self.tables = {}
 
+    @property
+    def logging(self) -> Union[bool, Callable[[str, Tuple[Any]], None]]:
+        """Return whether (or how) to log SQL queries."""
+        return self._logging
+
+    @logging.setter
+    def logging(self, logging: Union[bool, Callable[[str, Tuple[Any]], None]]):
+        """Change whether (or how) to log SQL queries.
+
+        The query listener is only registered while logging is
+        enabled, so disabled logging costs nothing per query.
+
+        Args:
+            logging (bool or callable): the new logging setting.
+
+        """
+        self._logging = logging
+        if self.engine is None:
+            return
+
+        listening = event.contains(
+            self.engine, "before_cursor_execute", self._log_listener
+        )
+        if logging and not listening:
+            event.listen(
+                self.engine, "before_cursor_execute", self._log_listener
+            )
+        elif not logging and listening:
+            event.remove(
+                self.engine, "before_cursor_execute", self._log_listener
+            )
+
+    def _log_query(self, conn, cursor, statement, parameters, *_):
+        """Log a query before it is sent to the database."""
+        log = self._logging
+        if callable(log):
+            log(statement.strip(), parameters)
+        elif logger.isEnabledFor(DEBUG):
+            logger.debug("%s %r", statement.strip(), parameters)
+
     def close(self):
         """Close the connection to the storage engine."""
         self.models = {}
@@ -166,6 +267,26 @@ class SQLStorageEngine(AbstractStorageEngine):
         if self.file_name:
             self.file_name.unlink()
 
+            # Remove the write-ahead log files, if any.
+            for suffix in ("-wal", "-shm"):
+                path = self.file_name.with_name(self.file_name.name + suffix)
+                if path.exists():
+                    path.unlink()
+
+    def truncate(self):
+        """Remove all stored rows, keeping bound models and tables.
+
+        The identity cache is cleared as well.  This is much faster
+        than destroying the storage engine and binding models again.
+
+        """
+        with self.connection.begin():
+            for table in reversed(self.metadata.sorted_tables):
+                self.connection.execute(table.delete())
+
+        self.cache.clear()
+        self.futures.clear()
+
     def bind(self, models: Optional[Set[Type[Model]]] = None):
         """Bind the speicifed models to this controller.
 
@@ -176,7 +297,17 @@ class SQLStorageEngine(AbstractStorageEngine):
         importing, which can make this choice complicated in some
         instances.
 
+        Binding models that are all bound already does nothing: this
+        skips resolving forward references and checking tables again.
+
         """
+        if models is not None and all(
+            self.models.get(get_model_name(model)) is model
+            and model.repository.storage_engine is self
+            for model in models
+        ):
+            return
+
         super().bind(models)
         self.metadata.create_all(self.engine)
         for model in models:
@@ -191,6 +322,9 @@ class SQLStorageEngine(AbstractStorageEngine):
             names (dict): the dictionary (name: model) of other models.
 
         """
+        if self.models.get(get_model_name(model)) is model:
+            return  # This model is already bound.
+
         columns = []
 
         # Browse model fields, creating columsn, indexes and constraints.
@@ -209,11 +343,14 @@ class SQLStorageEngine(AbstractStorageEngine):
             if custom:
                 f_type = self.add_custom_field_to_model(custom, model, field)
 
-            if origin is list or o_type is Sequence[f_type]:
+            if origin is list or info.extra.get("sequence", False):
                 # Analyze the back field.  If it's a list too, an
                 # intermediate table should be created.
-                field.outer_type_ = Sequence[f_type]
-                field.default = Sequence[f_type](
+                sequence = Sequence[f_type]
+                field.outer_type_ = sequence
+                info.extra["sequence"] = True
+                model.__sequences__ = model.__sequences__ | {name}
+                field.default = sequence(
                     left_model=model,
                     left_field=field,
                     right_model=f_type,
@@ -244,9 +381,7 @@ class SQLStorageEngine(AbstractStorageEngine):
                     continue
 
                 # Create foreign key fields.
-                to_name = getattr(
-                    f_type.__config__, "model_name", f_type.__name__.lower()
-                )
+                to_name = get_model_name(f_type)
                 primary_keys = {
                     name: field
                     for name, field in f_type.__fields__.items()
@@ -263,7 +398,8 @@ class SQLStorageEngine(AbstractStorageEngine):
                         )
                     )
 
-                # Add sort options.
+                # Add sort options.  Sequences are read (and their indexes
+                # shifted) by parent, in order, so index both columns.
                 if back.shape == SHAPE_LIST:
                     columns.append(
                         Column(
@@ -272,6 +408,13 @@ class SQLStorageEngine(AbstractStorageEngine):
                             nullable=not field.required,
                         )
                     )
+                    indexes.append(
+                        Index(
+                            f"idx_{get_model_name(model)}_{name}__index",
+                            *(f"{name}_{pname}" for pname in primary_keys),
+                            f"{name}__index",
+                        )
+                    )
                 continue
 
             # Handle enumerations here.
@@ -300,6 +443,13 @@ class SQLStorageEngine(AbstractStorageEngine):
                         "class.  Provide one with "
                         "Field(..., invalid_member=MyEnum.INVALID)"
                     )
+
+                # Map stored values to members, read for every row.
+                info.extra["enum_members"] = {
+                    member.value: member
+                    for member in f_type.__members__.values()
+                }
+                info.extra["enum_invalid"] = invalid
                 f_type = e_type
 
             sql_type = SQL_TYPES.get(f_type)
@@ -336,9 +486,7 @@ class SQLStorageEngine(AbstractStorageEngine):
                 Index(f"idx_{'_'.join(uniques)}", *uniques, unique=True)
             )
 
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
+        model_name = get_model_name(model)
         if model_name in self.models:
             raise ValueError(
                 f"the model {model} of name {model_name!r} conflicts with "
@@ -350,7 +498,17 @@ class SQLStorageEngine(AbstractStorageEngine):
             )
 
         self.models[model_name] = model
-        self.tables[model_name] = Table(model_name, self.metadata, *columns)
+        table = Table(model_name, self.metadata, *columns)
+        self.tables[model_name] = table
+
+        # Attach columns to fields, used by the query builder.
+        for name, pygasus in model.__pygasus__.items():
+            pygasus.__column__ = table.c.get(name)
+
+        self.row_plans.pop(model, None)
+        self.hydrators.clear()
+        self.metas.clear()
+        self.query_builder.clear_cache()
 
     def insert(
         self,
@@ -371,69 +529,183 @@ class SQLStorageEngine(AbstractStorageEngine):
             obj (Model): the new object.
 
         """
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
+        meta = self.get_meta(model)
+        obj, values = self._prepare_insert(meta, attrs, additional)
+        result = self.connection.execute(
+            meta.compiled_insert(tuple(values)), values
         )
-        exclude = set()
-        linked = set()
-        sql = {}
-        for name, field in model.__fields__.items():
-            info = field.field_info
-            o_type = field.outer_type_
-            f_type = field.type_
-            pygasus = getattr(model, field.name)
-            if o_type is Sequence[f_type]:
-                exclude.add(name)
-                linked.add(name)
-                continue
 
-            custom = self.custom_fields.get((model, field.name))
-            if custom:
-                value = attrs.get(name, field.get_default())
-                to_store = custom.to_storage(value)
-                attrs[name] = custom.to_field(to_store)
-                sql[name] = to_store
+        # Read the generated primary key from the cursor when possible.
+        if meta.rowid_pk:
+            obj._exists = False
+            setattr(obj, meta.rowid_pk, result.lastrowid)
+            obj._exists = True
+        elif meta.int_pk_names:
+            primary_keys = iter(result.inserted_primary_key)
+            obj._exists = False
+            for name in meta.int_pk_names:
+                setattr(obj, name, next(primary_keys))
+            obj._exists = True
+
+        self._link_inserted(meta, obj)
+        return obj
 
-            if issubclass(f_type, Model):
-                right = attrs.get(name, field.get_default())
-                if not isinstance(right, Model):  # Skip here (non valid).
-                    exclude.add(name)
-                    continue
+    def insert_many(
+        self,
+        model: Type[Model],
+        rows: List[Dict[str, Any]],
+        index: Optional[int] = None,
+    ) -> List[Model]:
+        """Add several new rows for this model at once.
 
-                primary_keys = {
-                    name: field
-                    for name, field in f_type.__fields__.items()
-                    if field.field_info.extra.get("primary_key")
-                }
+        All rows are validated first, then sent in a single
+        `executemany` inside a transaction: either all rows are
+        added, or none of them is.  Integer primary keys are
+        assigned before sending the rows, as executemany doesn't
+        report the generated keys.
 
-                for pname, pfield in primary_keys.items():
-                    value = getattr(right, pname)
-                    method = getattr(
-                        self,
-                        f"{pfield.outer_type_.__name__.lower()}_to_storage",
-                        None,
+        Args:
+            model (subclass of Model): the model class.
+            rows (list of dict): the attributes of each new object.
+            index (int, optional): if set, the index at which to
+                    place the new objects in their sequence.
+
+        Returns:
+            objs (list of Model): the new objects, in order.
+
+        """
+        meta = self.get_meta(model)
+        if len(meta.int_pk_names) > 1:
+            # Several generated keys can't be assigned beforehand.
+            if index is None:
+                return [self.insert(model, attrs) for attrs in rows]
+
+            step = 1 if index >= 0 else 0
+            return [
+                self.insert_at(model, attrs, index + i * step)
+                for i, attrs in enumerate(rows)
+            ]
+
+        if not rows:
+            return []
+
+        transaction = None
+        if not self.connection.in_transaction():
+            transaction = self.connection.begin()
+
+        try:
+            additionals = [None] * len(rows)
+            if index is not None:
+                # Shift each sequence once, for all its new rows.
+                groups = {}
+                for position, attrs in enumerate(rows):
+                    parents = self._get_parents(meta, attrs)
+                    groups.setdefault(parents, []).append(position)
+
+                for positions in groups.values():
+                    number = len(positions)
+                    base = self._shift_indexes(
+                        meta, rows[positions[0]], index, number
                     )
-                    if method:
-                        value = method(model, pfield, value)
-                    sql[f"{name}_{pname}"] = value
+                    first = 0 if index >= 0 else 1 - number
+                    for offset, position in enumerate(positions, first):
+                        additionals[position] = {
+                            name: value + offset
+                            for name, value in base.items()
+                        }
+
+            objs, values = [], []
+            for attrs, additional in zip(rows, additionals):
+                obj, row_values = self._prepare_insert(meta, attrs, additional)
+                objs.append(obj)
+                values.append(row_values)
+
+            # Assign integer primary keys.
+            if meta.int_pk_names:
+                name = meta.int_pk_names[0]
+                column = getattr(meta.table.c, name)
+                last = self.connection.execute(
+                    select(func.max(column))
+                ).scalar()
+                for key, obj, row_values in zip(
+                    count((last or 0) + 1), objs, values
+                ):
+                    row_values[name] = key
+                    obj._exists = False
+                    setattr(obj, name, key)
+                    obj._exists = True
+
+            # All rows must share the same columns.
+            columns = set().union(*values)
+            for row_values in values:
+                for column in columns - row_values.keys():
+                    row_values[column] = None
+
+            self.connection.execute(
+                meta.compiled_insert(tuple(values[0])), values
+            )
+        except Exception:
+            if transaction is not None:
+                transaction.rollback()
+            raise
+        else:
+            if transaction is not None:
+                transaction.commit()
+
+        for obj in objs:
+            self._link_inserted(meta, obj)
+
+        return objs
+
+    def _prepare_insert(
+        self,
+        meta: ModelMeta,
+        attrs: Dict[str, Any],
+        additional: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Model, Dict[str, Any]]:
+        """Validate a new object and return the values to insert.
+
+        Args:
+            meta (ModelMeta): the model metadata.
+            attrs (dict): the model attributes.
+            additional (opt dict): other attributes, not used in the model.
+
+        Returns:
+            obj, values (Model, dict): the new object, not yet cached,
+                    and the column values of its row.
 
-                exclude.add(name)
+        """
+        model = meta.model
+        sql = {}
+        for name, field, custom in meta.custom_fields:
+            value = attrs.get(name, field.get_default())
+            to_store = custom.to_storage(value)
+            attrs[name] = custom.to_field(to_store)
+            sql[name] = to_store
+
+        for name, field, f_type, primary_keys, _ in meta.relation_fields:
+            right = attrs.get(name, field.get_default())
+            if not isinstance(right, Model):  # Skip here (non valid).
                 continue
 
-            if issubclass(f_type, enum.Enum):
-                sql[name] = attrs[name].value
+            for pname, pfield, column in primary_keys:
+                value = getattr(right, pname)
+                method = self.to_storage_converters.get(pfield.outer_type_)
+                if method:
+                    value = method(model, pfield, value)
+                sql[column] = value
+
+        for name in meta.enum_names:
+            sql[name] = attrs[name].value
 
-            # Convert the field, if necessary.
-            method = getattr(
-                self, f"{o_type.__name__.lower()}_to_storage", None
-            )
+        # Convert the fields, if necessary.
+        for name, field in meta.stored_fields:
+            method = self.to_storage_converters.get(field.outer_type_)
             if method:
                 sql[name] = method(model, field, attrs[name])
 
-            pk = info.extra.get("primary_key", False)
-            if pk and issubclass(f_type, int):
-                attrs[name] = 1
-                exclude.add(name)
+        for name in meta.int_pk_names:
+            attrs[name] = 1
 
         if additional:
             sql.update(additional)
@@ -448,48 +720,33 @@ class SQLStorageEngine(AbstractStorageEngine):
             pygasus = getattr(model, name)
             pygasus.perform_update(obj, None, attr)
 
-        # Create a row.
-        table = self.tables[model_name]
-        insert = table.insert().values(dict(obj.dict(exclude=exclude), **sql))
-        result = self.connection.execute(insert)
+        # Read stored values directly, rather than serializing the
+        # whole model with pydantic.
+        fields = obj.__dict__
+        values = {name: fields[name] for name in meta.insert_names}
+        values.update(sql)
+        return obj, values
+
+    def _link_inserted(self, meta: ModelMeta, obj: Model):
+        """Link a newly-inserted object to its collections and cache it.
+
+        Args:
+            meta (ModelMeta): the model metadata.
+            obj (Model): the new object.
 
-        primary_keys = iter(result.inserted_primary_key)
+        """
         obj._exists = False
-        pks = []
-        for name, field in model.__fields__.items():
-            info = field.field_info
-            f_type = field.type_
-            pk = info.extra.get("primary_key", False)
-            if pk:
-                if issubclass(f_type, int):
-                    value = next(primary_keys)
-                    setattr(obj, name, value)
-                else:
-                    value = attrs[name]
-                pks.append(value)
-            elif name in linked:
-                # This is a linked field, we need to set the parent.
-                getattr(obj, name).parent = obj
+        for name in meta.sequence_names:
+            getattr(obj, name).parent = obj
+
+        for name, _, _ in meta.custom_fields:
+            custom = getattr(obj, name)
+            custom.parent = obj
+            custom.field = name
 
         obj._exists = True
         self.cache_instance(obj)
 
-        for name, field in model.__fields__.items():
-            info = field.field_info
-            o_type = field.outer_type_
-            f_type = field.type_
-            pk = info.extra.get("primary_key", False)
-            if o_type is Sequence[f_type]:
-                obj._exists = False
-                setattr(getattr(obj, name), "parent", obj)
-                obj._exists = True
-            elif self.custom_fields.get((model, field.name)):
-                custom = getattr(obj, name)
-                custom.parent = obj
-                custom.field = name
-
-        return obj
-
     def place_at(
         self,
         model: Type[Model],
@@ -508,29 +765,19 @@ class SQLStorageEngine(AbstractStorageEngine):
             additional (opt dict): other attributes, not used in the model.
 
         """
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
-        table = self.tables[model_name]
-        for name, field in model.__fields__.items():
-            f_type = field.type_
+        meta = self.get_meta(model)
+        table = meta.table
+        for relation in meta.relation_fields:
+            name, field, f_type, primary_keys, col_name = relation
             if f_type is sequence.left_model:
                 back = self.get_back_field(model, field, f_type)
-                if back.shape == SHAPE_LIST:
-                    col_name = f"{name}__index"
+                if col_name:
                     col = getattr(table.c, col_name)
 
-                    # Calculate the primary keys for this field.
-                    primary_keys = {
-                        name: field
-                        for name, field in f_type.__fields__.items()
-                        if field.field_info.extra.get("primary_key")
-                    }
-
                     pk_where = []
-                    for pname, pfield in primary_keys.items():
+                    for pname, pfield, column in primary_keys:
                         pk_where.append(
-                            getattr(table.c, f"{name}_{pname}")
+                            getattr(table.c, column)
                             == getattr(sequence.parent, pname)
                         )
 
@@ -541,15 +788,13 @@ class SQLStorageEngine(AbstractStorageEngine):
                         new_value = col - 1
                         old_index = old_parent.index(instance)
                         where = []
-                        for pname, pfield in primary_keys.items():
+                        for pname, pfield, column in primary_keys:
                             where.append(
-                                getattr(table.c, f"{name}_{pname}")
+                                getattr(table.c, column)
                                 == getattr(old_back, pname)
                             )
 
-                        where.append(
-                            getattr(table.c, f"{name}__index") >= old_index
-                        )
+                        where.append(col >= old_index)
 
                         update = (
                             table.update()
@@ -564,9 +809,7 @@ class SQLStorageEngine(AbstractStorageEngine):
                         # So we move these with a great index.
                         new_value = col + 1
                         where = list(pk_where)
-                        where.append(
-                            getattr(table.c, f"{name}__index") >= index
-                        )
+                        where.append(col >= index)
 
                         update = (
                             table.update()
@@ -578,21 +821,14 @@ class SQLStorageEngine(AbstractStorageEngine):
                     # Finally, we assign the new index.
                     where = []
                     values = {col_name: index}
-                    for pname, pfield in model.__fields__.items():
-                        if not pfield.field_info.extra.get(
-                            "primary_key", False
-                        ):
-                            continue
-
+                    for pname in meta.pk_names:
                         where.append(
-                            getattr(table.c, pfield.name)
+                            getattr(table.c, pname)
                             == getattr(instance, pname)
                         )
 
-                    for pname, pfield in primary_keys.items():
-                        values[f"{name}_{pname}"] = getattr(
-                            sequence.parent, pname
-                        )
+                    for pname, pfield, column in primary_keys:
+                        values[column] = getattr(sequence.parent, pname)
 
                     update = table.update().where(*where).values(values)
                     self.connection.execute(update)
@@ -618,73 +854,200 @@ class SQLStorageEngine(AbstractStorageEngine):
             obj (Model): the new object.
 
         """
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
-        table = self.tables[model_name]
+        meta = self.get_meta(model)
+        additional = self._shift_indexes(meta, attrs, index)
+        return self.insert(model, attrs, additional)
+
+    def _shift_indexes(
+        self,
+        meta: ModelMeta,
+        attrs: Dict[str, Any],
+        index: int,
+        number: int = 1,
+    ) -> Dict[str, int]:
+        """Make room for new rows at this index in their sequences.
+
+        Args:
+            meta (ModelMeta): the model metadata.
+            attrs (dict): the attributes of the new objects (only
+                    their sequence parents are read).
+            index (int): the index at which to add these objects.
+            number (int): the number of objects to make room for.
+
+        Returns:
+            additional (dict): the index columns of the new row.
+
+        """
+        if index >= 0:
+            statements = meta.shift_indexes
+        else:
+            statements = meta.unshift_indexes
+
         additional = {}
-        for name, field in model.__fields__.items():
-            f_type = field.type_
-            if issubclass(f_type, Model):
-                back = self.get_back_field(model, field, f_type)
-                if back.shape == SHAPE_LIST:
-                    right = attrs.get(name, field.get_default())
-                    cmp = operator.le if index < 0 else operator.ge
-                    where = [cmp(getattr(table.c, f"{name}__index"), index)]
-                    primary_keys = {
-                        name: field
-                        for name, field in f_type.__fields__.items()
-                        if field.field_info.extra.get("primary_key")
-                    }
-
-                    for pname, pfield in primary_keys.items():
-                        where.append(
-                            getattr(table.c, f"{name}_{pname}")
-                            == getattr(right, pname)
-                        )
+        for name, field, _, primary_keys, col_name in meta.relation_fields:
+            if col_name:
+                right = attrs.get(name, field.get_default())
+                params = {
+                    f"parent_{pname}": getattr(right, pname)
+                    for pname, _, _ in primary_keys
+                }
+                params["index"] = index
+                params["delta"] = number
+                self.connection.execute(statements[name], params)
+                additional[col_name] = index
 
-                    # Create and send the query.
-                    col_name = f"{name}__index"
-                    col = getattr(table.c, col_name)
-                    new_value = (col - 1) if index < 0 else (col + 1)
-                    update = (
-                        table.update()
-                        .where(*where)
-                        .values({getattr(table.c, col_name): new_value})
-                    )
-                    self.connection.execute(update)
-                    additional[col_name] = index
-        return self.insert(model, attrs, additional)
+        return additional
+
+    def _get_parents(
+        self, meta: ModelMeta, attrs: Dict[str, Any]
+    ) -> Tuple[Any, ...]:
+        """Return the primary keys of the sequence parents of a new row.
+
+        Args:
+            meta (ModelMeta): the model metadata.
+            attrs (dict): the attributes of the new object.
 
-    def select(self, model: Type[Model], query):
+        Returns:
+            parents (tuple): the parent keys, in field order.
+
+        """
+        parents = []
+        for name, field, _, primary_keys, col_name in meta.relation_fields:
+            if col_name:
+                right = attrs.get(name, field.get_default())
+                for pname, _, _ in primary_keys:
+                    parents.append(getattr(right, pname, None))
+
+        return tuple(parents)
+
+    def select(
+        self, model: Type[Model], query, load: Iterable[str] = ()
+    ) -> List[Model]:
         """Select one or more model instances with the specified query.
 
         Args:
             model (subclass of Model): the model object.
             query: the query object by which to filter.
+            load (iterable of str, optional): the names of sequences
+                    to load for all selected instances at once
+                    (see `load_sequences`).
 
         Returns:
             instances (list of Model): the model isntances or None.
 
         """
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
-        table = self.tables[model_name]
-        models = [model]
-        columns, tables = self._get_columns_for(model)
-        sql = select(*columns).select_from(table)
-        for join, on in tables:
-            models.append(self.models[join.name])
-            sql = sql.join(join, onclause=on, isouter=True)
-        sql = sql.where(query)
+        return list(self.select_iter(model, query, load=load))
+
+    def select_iter(
+        self,
+        model: Type[Model],
+        query,
+        batch_size: int = 1000,
+        load: Iterable[str] = (),
+    ) -> Iterator[Model]:
+        """Iterate over model instances matching the specified query.
+
+        Rows are fetched and hydrated in batches, so looping over
+        a large result set never holds every row in memory at once.
+
+        Args:
+            model (subclass of Model): the model object.
+            query: the query object by which to filter.
+            batch_size (int, optional): the number of rows to fetch
+                    at a time.
+            load (iterable of str, optional): the names of sequences
+                    to load for each batch of instances at once
+                    (see `load_sequences`).
+
+        Yields:
+            instance (Model): the model instances, one at a time.
+
+        """
+        meta = self.get_meta(model)
+        sql = meta.select.where(query)
+        load = tuple(load)
 
         # Send the query.
-        rows = self.connection.execute(sql).fetchall()
-        return [
-            self._build_objects_from_row(dict(row), models, first=True)
-            for row in rows
-        ]
+        result = self.connection.execute(sql)
+        try:
+            rows = result.fetchmany(batch_size)
+            while rows:
+                objs = self._bulk_hydrate(meta, rows)
+                if load:
+                    self.load_sequences(model, objs, load)
+                yield from objs
+                rows = result.fetchmany(batch_size)
+        finally:
+            result.close()
+
+    def load_sequences(
+        self, model: Type[Model], objs: List[Model], names: Iterable[str]
+    ):
+        """Load the sequences of several model instances at once.
+
+        Accessing a sequence that isn't loaded queries the storage,
+        so looping over instances and their sequences sends
+        one query per instance.  This method sends one query per
+        sequence name instead (or one per `GET_MANY_BATCH` instances),
+        and fills the sequences of all instances with the result.
+
+        Args:
+            model (subclass of Model): the model of the instances.
+            objs (list of Model): the instances whose sequences
+                    should be loaded.  Sequences already loaded
+                    are left untouched.
+            names (iterable of str): the names of the sequence fields.
+
+        """
+        meta = self.get_meta(model)
+        for name in names:
+            if meta.kinds.get(name) != SEQUENCE:
+                raise ValueError(
+                    f"{model.__name__}.{name} is not a sequence field"
+                )
+
+            # Read sequences without triggering their loading.
+            sequences = {}
+            for obj in objs:
+                sequence = object.__getattribute__(obj, name)
+                if not sequence._loaded:
+                    sequences[id(obj)] = (obj, sequence)
+
+            if not sequences:
+                continue
+
+            sequence = next(iter(sequences.values()))[1]
+            right_name = sequence.right_field.name
+            right_meta = self.get_meta(sequence.right_model)
+            primary_keys = right_meta.relations[right_name][3]
+            parents = []
+            for obj, _ in sequences.values():
+                key = []
+                for pname, pfield, _ in primary_keys:
+                    value = getattr(obj, pname)
+                    method = self.to_storage_converters.get(pfield.outer_type_)
+                    if method:
+                        value = method(model, pfield, value)
+                    key.append(value)
+                parents.append(key[0] if len(key) == 1 else tuple(key))
+
+            # Select related objects and group them by parent.
+            statement = right_meta.select_in(right_name)
+            related = {}
+            for start in range(0, len(parents), GET_MANY_BATCH):
+                end = start + GET_MANY_BATCH
+                result = self.connection.execute(
+                    statement, {"parents": parents[start:end]}
+                )
+                # Rows are ordered by parent, take each group at once.
+                for parent, others in groupby(
+                    self._bulk_hydrate(right_meta, result.fetchall()),
+                    key=operator.attrgetter(right_name),
+                ):
+                    related[id(parent)] = list(others)
+
+            for key, (_, sequence) in sequences.items():
+                sequence.set_loaded(related.get(key, []))
 
     def get(self, model: Type[Model], **kwargs):
         """Get a model instance with the specified arguments.
@@ -708,55 +1071,118 @@ class SQLStorageEngine(AbstractStorageEngine):
 
         """
         # First, check whether this object is in cache.
+        meta = self.get_meta(model)
         pks = []
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
-        table = self.tables[model_name]
-        models = [model]
-        for name, field in model.__fields__.items():
-            info = field.field_info
-            o_type = field.outer_type_
-            pk = info.extra.get("primary_key", False)
-            if pk:
-                value = kwargs.get(name, ...)
-                if value is not ...:
-                    method = getattr(
-                        self,
-                        f"{o_type.__name__.lower()}_to_storage",
-                        None,
-                    )
-                    if method:
-                        value = method(model, field, value)
-                    pks.append(value)
+        for name, field, _ in meta.pk_fields:
+            value = kwargs.get(name, ...)
+            if value is ...:
+                obj = self.get_instance_from_cache(model, kwargs)
+                break
+
+            method = self.to_storage_converters.get(field.outer_type_)
+            if method:
+                value = method(model, field, value)
+            pks.append(value)
+        else:
+            if pks:
+                obj = self.cache.get((model, *pks))
+            else:
+                obj = self.get_instance_from_cache(model, kwargs)
 
-        obj = self.get_instance_from_cache(model, kwargs)
         if obj is not None:
             return obj
 
-        columns, tables = self._get_columns_for(model)
-        query = select(*columns).select_from(table)
-        for join, on in tables:
-            models.append(self.models[join.name])
-            query = query.join(join, onclause=on, isouter=True)
-        where = []
+        params = {}
         for column, value in kwargs.items():
-            method = getattr(
-                self, f"{type(value).__name__.lower()}_to_storage", None
-            )
+            method = self.to_storage_converters.get(type(value))
             if method:
                 value = method(model, model.__fields__[column], value)
 
-            where.append(getattr(table.c, column) == value)
-        query = query.where(*where)
+            params[column] = value
+
         # Send the query.
-        rows = self.connection.execute(query).fetchall()
-        if len(rows) == 0 or len(rows) < 1:
-            return None
+        if meta.pk_names and params.keys() == set(meta.pk_names):
+            result = self.connection.execute(
+                meta.compiled_select_by_pk,
+                {
+                    param: params[name]
+                    for name, _, param in meta.pk_fields
+                },
+            )
+        else:
+            result = self.connection.execute(
+                meta.select_by(tuple(params)),
+                {f"by_{column}": value for column, value in params.items()},
+            )
+        objs = self._bulk_hydrate(meta, result.fetchall()[:1])
+        return objs[0] if objs else None
 
-        row = dict(rows[0])
-        obj = self._build_objects_from_row(row, models, first=True)
-        return obj
+    def get_many(
+        self, model: Type[Model], pks: List[Any]
+    ) -> List[Optional[Model]]:
+        """Get several model instances from their primary keys.
+
+        Instances in cache are returned right away, the others
+        are selected in a single query (or one query per
+        `GET_MANY_BATCH` missing primary keys).
+
+        Args:
+            model (subclass of Model): the model object.
+            pks (list): the primary key of each instance to retrieve,
+                    as a tuple if the model has several primary keys.
+
+        Returns:
+            instances (list of Model): the model instances, in the
+                    order of `pks`, None for the ones not found.
+
+        """
+        meta = self.get_meta(model)
+        if meta.select_many_by_pk is None:
+            raise ValueError(f"{model} has no primary key")
+
+        single = len(meta.pk_fields) == 1
+        converters = [
+            (field, self.to_storage_converters.get(field.outer_type_))
+            for _, field, _ in meta.pk_fields
+        ]
+
+        def to_key(values):
+            return tuple(
+                method(model, field, value) if method else value
+                for (field, method), value in zip(converters, values)
+            )
+
+        keys = []
+        for values in pks:
+            if single:
+                values = (values,)
+            elif len(values) != len(converters):
+                raise ValueError(
+                    f"expected {len(converters)} primary key values "
+                    f"for {model}, got {values!r}"
+                )
+            keys.append(to_key(values))
+
+        cache = self.cache
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            obj = cache.get((model, *key))
+            if obj is None:
+                missing.append(key[0] if single else key)
+            else:
+                found[key] = obj
+
+        for start in range(0, len(missing), GET_MANY_BATCH):
+            end = start + GET_MANY_BATCH
+            result = self.connection.execute(
+                meta.select_many_by_pk, {"pks": missing[start:end]}
+            )
+            for obj in self._bulk_hydrate(meta, result.fetchall()):
+                key = to_key(getattr(obj, name) for name in meta.pk_names)
+                found[key] = obj
+
+        return [found.get(key) for key in keys]
 
     def get_related(self, sequence: Sequence) -> List[Model]:
         """Retrieve the related objects from a sequence.
@@ -776,42 +1202,19 @@ class SQLStorageEngine(AbstractStorageEngine):
         left_model = sequence.left_model
         right_model = sequence.right_model
         pks = {}
-        left_model_name = getattr(
-            left_model.__config__, "model_name", left_model.__name__.lower()
-        )
-        right_model_name = getattr(
-            right_model.__config__, "model_name", right_model.__name__.lower()
+        left_model_name = get_model_name(left_model)
+        meta = self.get_meta(right_model)
+        for name in meta.pk_names:
+            value = getattr(parent, name, ...)
+            if value is not ...:
+                pks[f"{left_model_name}_{name}"] = value
+
+        # Send the query, ordered by index in the sequence.
+        query = meta.select_by(tuple(pks), f"{left_model_name}__index")
+        result = self.connection.execute(
+            query, {f"by_{column}": value for column, value in pks.items()}
         )
-        table = self.tables[right_model_name]
-        for name, field in right_model.__fields__.items():
-            info = field.field_info
-            pk = info.extra.get("primary_key", False)
-            if pk:
-                value = getattr(parent, name, ...)
-                if value is not ...:
-                    pks[f"{left_model_name}_{name}"] = value
-
-        columns, tables = self._get_columns_for(right_model)
-        query = select(*columns).select_from(table)
-        models = [right_model]
-        for join, on in tables:
-            models.append(self.models[join.name])
-            query = query.join(join, onclause=on, isouter=True)
-
-        where = []
-        for column, value in pks.items():
-            where.append(getattr(table.c, column) == value)
-        query = query.where(*where)
-
-        # Add ordering.
-        query = query.order_by(getattr(table.c, f"{left_model_name}__index"))
-        # Send the query.
-        rows = self.connection.execute(query).fetchall()
-        objs = [
-            self._build_objects_from_row(dict(row), models, first=True)
-            for row in rows
-        ]
-        return objs
+        return self._bulk_hydrate(meta, result.fetchall())
 
     def update(
         self,
@@ -829,44 +1232,172 @@ class SQLStorageEngine(AbstractStorageEngine):
             key (str): the name of the attribute to modify.
             old_value (Any): the value before the modification.
             new_value (Any): the value after the modification.
-            check_update (bool): if True (default), check the update.
 
         """
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
+        meta = self.get_meta(model)
+        sql_primary_keys = self._get_pk_params(meta, instance)
+        change = self._prepare_update(
+            meta, instance, key, old_value, new_value
         )
-        sql_table = self.tables[model_name]
-        sql_primary_keys = []
-        for name, field in model.__fields__.items():
-            info = field.field_info
-            pk = info.extra.get("primary_key", False)
-            if pk:
-                value = getattr(instance, name)
-                if isinstance(value, enum.Enum):
-                    value = value.value
+        if change is None:
+            return
+
+        pygasus, old_value, new_value, sql_columns = change
+
+        # Check that this update can be performed.
+        pygasus.validate_update(instance, old_value, new_value)
+        pygasus.perform_update(instance, old_value, new_value)
 
-                # Handle other field types.
-                method = getattr(
-                    self, f"{type(value).__name__.lower()}_to_storage", None
+        # Send the query.
+        self.connection.execute(
+            meta.compiled_update(tuple(sql_columns)),
+            dict(sql_primary_keys, **sql_columns),
+        )
+
+    def update_fields(
+        self, model: Type["Model"], instance: "Model", values: Dict[str, Any]
+    ):
+        """Update several attributes of an instance with a single query.
+
+        Every update is validated before any of them is performed.
+        The instance is only modified once the query has succeeded.
+        Relations whose foreign keys are stored on the other side
+        are updated afterward, on the other side.
+
+        Args:
+            model (subclass of Model): the model class.
+            instance (Model): the model object.
+            values (dict): the new value of each attribute to modify.
+
+        Raises:
+            ValueError: one of the keys isn't a field of the model,
+                    or is a sequence, which can't be replaced.
+
+        """
+        meta = self.get_meta(model)
+        for key in values:
+            if key not in model.__fields__:
+                raise ValueError(f"{model} has no field {key!r}")
+
+            if meta.kinds.get(key) == SEQUENCE:
+                raise ValueError(
+                    f"the field {key} on model {model.__name__} is a "
+                    "sequence, it can't be replaced"
                 )
-                if method:
-                    value = method(model, field, value)
 
-                # Handle custom fields.
-                custom = self.custom_fields.get((model, field.name))
-                if custom:
-                    value = custom.to_storage(value)
-                sql_primary_keys.append(getattr(sql_table.c, name) == value)
+        sql_primary_keys = self._get_pk_params(meta, instance)
+        changes = []
+        deferred = {}
+        for key, new_value in values.items():
+            owner = model.__fields__[key].field_info.extra.get("owner", True)
+            if meta.kinds[key] == RELATION and not owner:
+                deferred[key] = new_value
+                continue
+
+            old_value = getattr(instance, key, ...)
+            changes.append(
+                self._prepare_update(meta, instance, key, old_value, new_value)
+            )
 
+        # Check that all updates can be performed.
+        sql_columns = {}
+        for pygasus, old_value, new_value, columns in changes:
+            pygasus.validate_update(instance, old_value, new_value)
+            sql_columns.update(columns)
+
+        for key, new_value in deferred.items():
+            self._validate_back_update(model, instance, key, new_value)
+
+        if sql_columns:
+            self.connection.execute(
+                meta.compiled_update(tuple(sql_columns)),
+                dict(sql_primary_keys, **sql_columns),
+            )
+
+        # The query succeeded, apply the changes to the instance.
+        for pygasus, old_value, new_value, _ in changes:
+            pygasus.perform_update(instance, old_value, new_value)
+
+        instance._exists = False
+        for key, value in values.items():
+            if key not in deferred:
+                setattr(instance, key, value)
+        instance._exists = True
+
+        for key, value in deferred.items():
+            setattr(instance, key, value)
+
+    def _validate_back_update(
+        self,
+        model: Type["Model"],
+        instance: "Model",
+        key: str,
+        new_value: Any,
+    ):
+        """Validate a relation update performed on the other side.
+
+        The update is validated by the field of the owner, as it
+        would be when the update is actually performed.
+
+        Args:
+            model (subclass of Model): the model class.
+            instance (Model): the model object.
+            key (str): the name of the relation to modify.
+            new_value (Any): the value after the modification.
+
+        """
+        field = model.__fields__[key]
+        back_name = model.__pygasus__[key].__back__.name
+        back = field.type_.__pygasus__[back_name]
+        if new_value is not None and not isinstance(new_value, field.type_):
+            raise ValueError(
+                f"the field {key} on model {model.__name__} expects "
+                f"a {field.type_.__name__}, not {new_value!r}"
+            )
+
+        if new_value:
+            old_value = getattr(new_value, back.name, None)
+            back.validate_update(new_value, old_value, instance)
+        else:
+            old_value = getattr(instance, key, None)
+            if old_value:
+                back.validate_update(old_value, instance, None)
+
+    def _prepare_update(
+        self,
+        meta: ModelMeta,
+        instance: "Model",
+        key: str,
+        old_value: Any,
+        new_value: Any,
+    ) -> Optional[Tuple[Any, Any, Any, Dict[str, Any]]]:
+        """Convert an attribute update to the columns to update.
+
+        Relations whose foreign keys are stored on the other side
+        are updated on the other side right away.
+
+        Args:
+            meta (ModelMeta): the model metadata.
+            instance (Model): the model object.
+            key (str): the name of the attribute to modify.
+            old_value (Any): the value before the modification.
+            new_value (Any): the value after the modification.
+
+        Returns:
+            change (tuple or None): the Pygasus field, the old value,
+                    the new value (converted for storage) and the column
+                    values to update, or None if the update was
+                    performed on the other side of a relation.
+
+        """
+        model = meta.model
         field = model.__fields__[key]
         # Handles enum field.
         if isinstance(new_value, enum.Enum):
             new_value = new_value.value
 
         # Handle other field types.
-        method = getattr(
-            self, f"{type(new_value).__name__.lower()}_to_storage", None
-        )
+        method = self.to_storage_converters.get(type(new_value))
         if method:
             new_value = method(model, field, new_value)
 
@@ -876,46 +1407,71 @@ class SQLStorageEngine(AbstractStorageEngine):
             new_value = custom.to_storage(new_value)
 
         sql_columns = {key: new_value}
-        f_type = field.type_
         pygasus = model.__pygasus__[field.name]
-        if issubclass(f_type, Model):
-            if not field.field_info.extra.get("owner", True) and new_value:
-                old_value = getattr(new_value, pygasus.__back__.name, None)
-                return self.update(
-                    type(new_value),
-                    new_value,
-                    pygasus.__back__.name,
-                    old_value,
-                    instance,
-                )
+        if meta.kinds[key] == RELATION:
+            if not field.field_info.extra.get("owner", True):
+                # The foreign keys are stored on the other side,
+                # a single update of the owner is enough.
+                back_name = pygasus.__back__.name
+                if new_value:
+                    old_value = getattr(new_value, back_name, None)
+                    self.update(
+                        type(new_value),
+                        new_value,
+                        back_name,
+                        old_value,
+                        instance,
+                    )
+                elif old_value:
+                    setattr(old_value, back_name, None)
 
-            sql_columns = {}
-            linked_keys = {
-                linked_name: linked_field
-                for linked_name, linked_field in f_type.__fields__.items()
-                if linked_field.field_info.extra.get("primary_key")
-            }
+                return None
 
-            for pname, pfield in linked_keys.items():
+            sql_columns = {}
+            _, _, _, linked_keys, _ = meta.relations[key]
+            for pname, pfield, column in linked_keys:
                 value = new_value and getattr(new_value, pname) or None
-                method = getattr(
-                    self,
-                    f"{pfield.outer_type_.__name__.lower()}_to_storage",
-                    None,
+                method = self.to_storage_converters.get(
+                    pfield.outer_type_
                 )
                 if method and value is not None:
                     value = method(model, pfield, value)
-                sql_columns[f"{field.name}_{pname}"] = value
+                sql_columns[column] = value
 
-        # Check that this update can be performed.
-        pygasus.validate_update(instance, old_value, new_value)
-        pygasus.perform_update(instance, old_value, new_value)
+        return pygasus, old_value, new_value, sql_columns
 
-        # Send the query.
-        update = (
-            sql_table.update().where(*sql_primary_keys).values(**sql_columns)
-        )
-        self.connection.execute(update)
+    def _get_pk_params(
+        self, meta: ModelMeta, instance: "Model"
+    ) -> Dict[str, Any]:
+        """Return the parameters filtering on an instance's primary keys.
+
+        Args:
+            meta (ModelMeta): the model metadata.
+            instance (Model): the model object.
+
+        Returns:
+            params (dict): the `pk_{name}` parameters, as stored.
+
+        """
+        model = meta.model
+        sql_primary_keys = {}
+        for name, field, param in meta.pk_fields:
+            value = getattr(instance, name)
+            if isinstance(value, enum.Enum):
+                value = value.value
+
+            # Handle other field types.
+            method = self.to_storage_converters.get(type(value))
+            if method:
+                value = method(model, field, value)
+
+            # Handle custom fields.
+            custom = self.custom_fields.get((model, field.name))
+            if custom:
+                value = custom.to_storage(value)
+            sql_primary_keys[param] = value
+
+        return sql_primary_keys
 
     def delete(self, model: Type[Model], instance: Model):
         """Delete the specified model.
@@ -927,35 +1483,24 @@ class SQLStorageEngine(AbstractStorageEngine):
         The model also is removed from cache.
 
         """
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
-        sql_table = self.tables[model_name]
-        sql_primary_keys = []
-        pks = []
-        for name, field in model.__fields__.items():
-            info = field.field_info
-            pk = info.extra.get("primary_key", False)
-            pygasus = model.__pygasus__[name]
-            if pk:
-                value = getattr(instance, name)
-                # Convert other field types.
-                method = getattr(
-                    self, f"{type(value).__name__.lower()}_to_storage", None
-                )
-                if method:
-                    value = method(model, field, value)
-                sql_primary_keys.append(getattr(sql_table.c, name) == value)
-                pks.append(value)
+        meta = self.get_meta(model)
+        sql_primary_keys = {}
+        for name, field, param in meta.pk_fields:
+            value = getattr(instance, name)
+            # Convert other field types.
+            method = self.to_storage_converters.get(type(value))
+            if method:
+                value = method(model, field, value)
+            sql_primary_keys[param] = value
 
+        for pygasus in model.__pygasus__.values():
             pygasus.validate_delete(instance)
 
         # Remove this object from cache.
         self.delete_instance_from_cache(instance)
 
         # Send the query.
-        delete = sql_table.delete().where(*sql_primary_keys)
-        self.connection.execute(delete)
+        self.connection.execute(meta.compiled_delete, sql_primary_keys)
 
         # Apply other updates if necessary.
         for pygasus in model.__pygasus__.values():
@@ -972,33 +1517,23 @@ class SQLStorageEngine(AbstractStorageEngine):
             number (int): the number of deleted rows.
 
         """
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
-        table = self.tables[model_name]
-        pks = []
-        for name, field in model.__fields__.items():
-            info = field.field_info
-            pk = info.extra.get("primary_key", False)
-            if pk:
-                pks.append(name)
-
-        sql = table.delete().where(query)
-
-        # Perform a select (this will be an additional query, but
-        # we need to safely invalidate the cache).
-        for obj in self.select(model, query):
-            specific_pks = []
-            for name in pks:
-                value = getattr(obj, name)
-                # Convert other field types.
-                method = getattr(
-                    self, f"{type(value).__name__.lower()}_to_storage", None
-                )
-                if method:
-                    value = method(model, field, value)
-                specific_pks.append(value)
-            self.cache.pop((model,) + tuple(specific_pks), None)
+        meta = self.get_meta(model)
+        sql = meta.table.delete().where(query)
+
+        # Select the primary keys of deleted rows (this will be an
+        # additional query, but we need to safely invalidate the cache).
+        # Only the cached objects among them are invalidated.
+        table = meta.table
+        pk_columns = [getattr(table.c, name) for name in meta.pk_names]
+        if pk_columns:
+            rows = self.connection.execute(
+                select(*pk_columns).select_from(table).where(query)
+            )
+            cache = self.cache
+            for row in rows:
+                obj = cache.get((model, *row))
+                if obj is not None:
+                    self.delete_instance_from_cache(obj)
 
         # Send the query.
         ret = self.connection.execute(sql)
@@ -1010,6 +1545,8 @@ class SQLStorageEngine(AbstractStorageEngine):
         """Return the relevant columns for the specified model.
 
         This method returns the list of columns an list of tables to join.
+        The result of a top-level call (without explored relations)
+        only depends on the model, so it is cached until the next bind.
 
         Args:
             model (subclass of Model): the model.
@@ -1020,29 +1557,24 @@ class SQLStorageEngine(AbstractStorageEngine):
                     this model.
 
         """
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
-        relations = relations or set()
+        if relations is None:
+            meta = self.get_meta(model)
+            return meta.columns, meta.tables
+
+        model_name = get_model_name(model)
         columns = []
         table = self.tables[model_name]
         tables = []
         for name, field in model.__fields__.items():
-            o_type = field.outer_type_
             f_type = field.type_
-            if issubclass(f_type, Model) and o_type is not Sequence[f_type]:
+            sequence = field.field_info.extra.get("sequence", False)
+            if issubclass(f_type, Model) and not sequence:
                 # Join up.
                 rel_count = field.field_info.extra["relationship_count"]
                 if rel_count not in relations:
                     tables.append(
                         (
-                            self.tables[
-                                getattr(
-                                    f_type.__config__,
-                                    "model_name",
-                                    f_type.__name__.lower(),
-                                )
-                            ],
+                            self.tables[get_model_name(f_type)],
                             field.field_info.extra["relationship_on"],
                         )
                     )
@@ -1053,25 +1585,136 @@ class SQLStorageEngine(AbstractStorageEngine):
                     )
                     columns.extend(other_columns)
                     tables.extend(other_tables)
-            elif o_type is not Sequence[f_type]:
+            elif not sequence:
                 columns.append(
                     getattr(table.c, name).label(f"{model_name}_{name}")
                 )
 
         return columns, tables
 
+    def get_meta(self, model: Type[Model]) -> ModelMeta:
+        """Return the metadata of a model, building it if needed.
+
+        Args:
+            model (subclass of Model): the bound model.
+
+        Returns:
+            meta (ModelMeta): the model metadata.
+
+        """
+        meta = self.metas.get(model)
+        if meta is None:
+            meta = ModelMeta(self, model)
+            self.metas[model] = meta
+
+        return meta
+
+    def _get_row_plan(
+        self, model: Type[Model]
+    ) -> Tuple[Tuple[str, Callable[[Any], Any]], ...]:
+        """Return the row plan of a model, building it if needed.
+
+        The row plan contains, for every stored field of the model
+        that needs to be converted when read from the storage, its
+        column label and the converter to apply.
+
+        Args:
+            model (subclass of Model): the model.
+
+        Returns:
+            plan (tuple): a tuple of `(label, converter)` pairs.
+
+        """
+        plan = self.row_plans.get(model)
+        if plan is not None:
+            return plan
+
+        model_name = get_model_name(model)
+        plan = []
+        for name, field, kind in self.get_meta(model).fields:
+            pk = field.field_info.extra.get("primary_key", False)
+            if not pk and kind != SCALAR:
+                continue
+
+            method = self.from_storage_converters.get(field.type_)
+            if method:
+                plan.append(
+                    (f"{model_name}_{name}", partial(method, model, field))
+                )
+
+        plan = tuple(plan)
+        self.row_plans[model] = plan
+        return plan
+
+    def _bulk_hydrate(self, meta: ModelMeta, rows: List[Any]) -> List[Model]:
+        """Build model objects from a whole result set.
+
+        Values are converted column by column before rows are handed
+        to `_build_objects_from_row`, so converters are applied
+        in a single pass over each column, rather than once per field
+        for every row.
+
+        Args:
+            meta (ModelMeta): the metadata of the selected model.
+            rows (list): the rows to convert, selected with `meta.select`.
+
+        Returns:
+            objs (list of Model): the first model of each row.
+
+        """
+        if not rows:
+            return []
+
+        columns = None
+        for model in dict.fromkeys(meta.models):
+            for label, convert in self._get_row_plan(model):
+                index = meta.column_index.get(label)
+                if index is None:
+                    continue
+
+                if columns is None:
+                    columns = list(zip(*rows))
+
+                column = columns[index]
+                if None in column:
+                    column = [
+                        None if value is None else convert(value)
+                        for value in column
+                    ]
+                else:
+                    column = list(map(convert, column))
+                columns[index] = column
+
+        if columns is not None:
+            rows = zip(*columns)
+
+        # Link optional relations once every object of the batch is
+        # built.  Related objects are kept alive until then, as the
+        # identity cache only holds weak references.
+        build = self._build_objects_from_row
+        built = [build(row, meta.models, meta, first=False) for row in rows]
+        if self.futures:
+            self._apply_futures()
+        return list(map(operator.itemgetter(0), built))
+
     def _build_objects_from_row(
         self,
-        row: Dict[str, Any],
+        row: Tuple[Any],
         models: Tuple[Type[Model]],
+        layout: ModelMeta,
         first: bool = True,
         done: Optional[Tuple[Type[Model]]] = None,
     ) -> Union[Model, Tuple[Model]]:
         """Create one or more model objects from this row.
 
+        Values of the row should already have been converted
+        (see `_bulk_hydrate`).
+
         Args:
-            row (dict): a dictionary containing row data.
+            row (tuple): the row values, read by position.
             models (tuple): the tuple of subclasses of models.
+            layout (ModelMeta): the metadata of the model whose select
+                    statement produced the row.
             first (bool): if True (the default), return only the first model.
             done (opt): tuple of models that were already processed.
 
@@ -1082,139 +1725,242 @@ class SQLStorageEngine(AbstractStorageEngine):
         done = done or ()
         objs = []
         done = list(done)
-        customs = []
         for model in models:
-            customs = []
             done.append(model)
-            model_name = getattr(
-                model.__config__, "model_name", model.__name__.lower()
-            )
-
-            # Browse the model's fields.
-            attrs = {}
-            others = []
-            pks = []
-            not_set = False
-            for name, field in model.__fields__.items():
-                info = field.field_info
-                o_type = field.outer_type_
-                f_type = field.type_
-                pk = info.extra.get("primary_key", False)
-                value = row.get(f"{model_name}_{name}", ...)
-                custom = self.custom_fields.get((model, field.name))
-                if pk:
-                    if value is ... or value is None:
-                        not_set = True
-                        break
-
-                    # Convert the field, if necessary.
-                    value = row[f"{model_name}_{name}"]
-                    method = getattr(
-                        self,
-                        f"{f_type.__name__.lower()}_from_storage",
-                        None,
-                    )
-                    if method:
-                        value = method(model, field, value)
-
-                    pks.append(value)
-                    attrs[name] = value
-                elif custom:
-                    value = custom.to_field(value)
-                    customs.append((value, name))
-                    attrs[name] = value
-                elif (
-                    isinstance(f_type, type)
-                    and issubclass(f_type, Model)
-                    and o_type is not Sequence[f_type]
-                ):
-                    if not field.required:
-                        attrs[name] = field.get_default()
-
-                        # Prepare the future.
-                        pkeys = tuple(
-                            row[f"{model_name}_{pk.name}"]
-                            for pk in model.__fields__.values()
-                            if pk.field_info.extra.get("primary_key", False)
-                        )
-                        link_pkeys = tuple(
-                            row[f"{name}_{pk.name}"]
-                            for pk in f_type.__fields__.values()
-                            if pk.field_info.extra.get("primary_key", False)
-                        )
-                        self.futures.add(
-                            (model, pkeys, name, f_type, link_pkeys)
-                        )
-                    else:
-                        obj = self._build_objects_from_row(
-                            row, (f_type,), done=tuple(done)
-                        )
-                        others.append(obj)
-                        attrs[name] = obj
-
-                        # Check whether this update would be possible.
-                        pygasus = model.__pygasus__[name]
-                        pygasus.validate_update(model, None, obj)
-                elif issubclass(f_type, enum.Enum):
-                    try:
-                        value = f_type(value)
-                    except ValueError:
-                        invalid_key = getattr(
-                            model.__config__, "invalid_enum_key", "INVALID"
-                        )
-                        value = getattr(f_type, invalid_key)
-                    finally:
-                        attrs[name] = value
-                elif o_type is not Sequence[f_type]:
-                    value = row[f"{model_name}_{name}"]
-                    method = getattr(
-                        self,
-                        f"{f_type.__name__.lower()}_from_storage",
-                        None,
-                    )
-                    if method:
-                        value = method(model, field, value)
-
-                    attrs[name] = value
+            built = self._get_hydrator(model, layout)(row, done)
 
             # If the object is not complete, don't build it.
-            if not_set:
+            if built is None:
                 continue
 
-            obj = self.get_instance_from_cache(model, attrs)
-            if obj is not None:
-                objs.append(obj)
-            else:
-                obj = model(**attrs)
-                for field, name in customs:
-                    field.parent = obj
-                    field.field = name
-                self.cache_instance(obj)
-                objs.append(obj)
-                for name, field in model.__fields__.items():
-                    info = field.field_info
-                    o_type = field.outer_type_
-                    f_type = field.type_
-                    pk = info.extra.get("primary_key", False)
-                    if o_type is Sequence[f_type]:
-                        obj._exists = False
-                        col = getattr(obj, name)
-                        col.parent = obj
-                        obj._exists = True
-
-                # Update Pygasus fields.
-                for pygasus in type(obj).__pygasus__.values():
-                    value = attrs.get(pygasus.name)
-                    pygasus.perform_update(obj, None, value)
-
+            obj, others = built
+            objs.append(obj)
             objs.extend(others)
 
-        self._apply_futures()
         if not objs:
             objs = [None]
 
         return objs[0] if first else objs
 
+    def _get_hydrator(
+        self, model: Type[Model], layout: ModelMeta
+    ) -> Callable:
+        """Return the hydrator of a model, compiling it if needed.
+
+        Args:
+            model (subclass of Model): the model.
+            layout (ModelMeta): the metadata of the selected model,
+                    which determines the position of columns.
+
+        Returns:
+            hydrator (callable): the hydrator function.
+
+        """
+        key = (model, layout.model)
+        hydrator = self.hydrators.get(key)
+        if hydrator is None:
+            hydrator = self._compile_hydrator(model, layout)
+            self.hydrators[key] = hydrator
+
+        return hydrator
+
+    def _compile_hydrator(
+        self, model: Type[Model], layout: ModelMeta
+    ) -> Callable:
+        """Generate the function building a model object from a row.
+
+        Rather than browsing the model fields for every row, this
+        method browses them once and generates the source code of
+        a function reading every field from the row in straight-line
+        code.  Converters, enumerations, custom fields and related
+        models are bound as global names of the generated function.
+
+        The generated function expects an already-converted row
+        (see `_bulk_hydrate`), whose columns are read by position,
+        and the list of models already processed.
+        It returns `None` if the row doesn't contain this model,
+        or a tuple `(obj, others)` containing the model object and
+        the list of related objects built along with it.
+
+        Args:
+            model (subclass of Model): the model.
+            layout (ModelMeta): the metadata of the selected model,
+                    which determines the position of columns.
+
+        Returns:
+            hydrator (callable): the generated function.
+
+        """
+        model_name = get_model_name(model)
+        namespace = {
+            "model": model,
+            "engine": self,
+            "layout": layout,
+            "build": self._build_objects_from_row,
+            "add_future": self.futures.add,
+            "get_instance_from_cache": self.get_instance_from_cache,
+            "cache_instance": self.cache_instance,
+        }
+
+        def constant(prefix: str, value: Any) -> str:
+            """Add a global to the generated function, return its name."""
+            name = f"{prefix}_{len(namespace)}"
+            namespace[name] = value
+            return name
+
+        def storage_value(field: Field, label: str) -> str:
+            """Return the expression of a stored value in the row."""
+            value = f"row[{index[label]}]"
+            method = self.to_storage_converters.get(field.outer_type_)
+            if method is None:
+                return value
+
+            method = constant("to_storage", method)
+            field = constant("field", field)
+            return (
+                f"(None if {value} is None "
+                f"else {method}(model, {field}, {value}))"
+            )
+
+        index = layout.column_index
+        function_name = f"_hydrate_{model.__name__}"
+        lines = [
+            f"def {function_name}(row, done):",
+            "    attrs = {}",
+            "    others = []",
+        ]
+        futures = []
+        customs = []
+        sequences = []
+
+        # Look for the object in the cache before reading other fields:
+        # rows of a join often repeat the same related object.
+        pkeys = "".join(
+            f"{storage_value(pk, f'{model_name}_{pk.name}')}, "
+            for pk in model.__fields__.values()
+            if pk.field_info.extra.get("primary_key", False)
+        )
+        if pkeys:
+            lines += [
+                f"    pks = ({pkeys})",
+                "    obj = engine.cache.get((model, *pks))",
+                "    if obj is not None:",
+                "        return obj, others",
+            ]
+
+        for name, field, kind in self.get_meta(model).fields:
+            f_type = field.type_
+            pk = field.field_info.extra.get("primary_key", False)
+            label = f"{model_name}_{name}"
+            if kind == SEQUENCE:
+                sequences.append(name)
+                continue
+
+            if pk:
+                lines += [
+                    f"    value = row[{index[label]}]",
+                    "    if value is None:",
+                    "        return None",
+                    f"    attrs[{name!r}] = value",
+                ]
+            elif kind == CUSTOM:
+                custom = self.custom_fields[(model, name)]
+                value = f"custom_value_{len(customs)}"
+                lines += [
+                    f"    {value} = {constant('custom', custom)}.to_field("
+                    f"row[{index[label]}])",
+                    f"    attrs[{name!r}] = {value}",
+                ]
+                customs.append((value, name))
+            elif kind == RELATION:
+                if not field.required:
+                    default = constant("default", field.get_default)
+                    lines.append(f"    attrs[{name!r}] = {default}()")
+                    futures.append((name, field, f_type))
+                else:
+                    validate = constant(
+                        "validate", model.__pygasus__[name].validate_update
+                    )
+                    lines += [
+                        "    obj = build(row, "
+                        f"({constant('model', f_type)},), layout, "
+                        "done=tuple(done))",
+                        "    others.append(obj)",
+                        f"    attrs[{name!r}] = obj",
+                        f"    {validate}(model, None, obj)",
+                    ]
+            elif kind == ENUM:
+                extra = field.field_info.extra
+                enum_type = constant("enum", f_type)
+                members = constant("members", extra["enum_members"])
+                invalid = constant("invalid", extra["enum_invalid"])
+
+                # Combined flags aren't named members, build them.
+                lines += [
+                    f"    value = row[{index[label]}]",
+                    f"    member = {members}.get(value)",
+                    "    if member is None:",
+                    "        try:",
+                    f"            member = {enum_type}(value)",
+                    "        except ValueError:",
+                    f"            member = {invalid}",
+                    f"    attrs[{name!r}] = member",
+                ]
+            else:
+                lines.append(f"    attrs[{name!r}] = row[{index[label]}]")
+
+        # Prepare the futures, once the object is known to be complete.
+        for name, field, f_type in futures:
+            link_pkeys = "".join(
+                f"{storage_value(pk, f'{name}_{pk.name}')}, "
+                for pk in f_type.__fields__.values()
+                if pk.field_info.extra.get("primary_key", False)
+            )
+            # A missing link (NULL foreign keys) is never resolved.
+            lines += [
+                f"    link = ({link_pkeys})",
+                "    if None not in link:",
+                f"        add_future((model, pks, {name!r}, "
+                f"{constant('model', f_type)}, link))",
+            ]
+
+        if not pkeys:
+            lines += [
+                "    obj = get_instance_from_cache(model, attrs)",
+                "    if obj is not None:",
+                "        return obj, others",
+            ]
+        # Stored values were validated before being written, build the
+        # object without validating them again.
+        lines += [
+            "    obj = model.construct(**attrs)",
+            "    obj._exists = True",
+        ]
+        for value, name in customs:
+            lines += [
+                f"    {value}.parent = obj",
+                f"    {value}.field = {name!r}",
+            ]
+        lines.append("    cache_instance(obj)")
+        if sequences:
+            lines.append("    obj._exists = False")
+            for name in sequences:
+                lines.append(f"    getattr(obj, {name!r}).parent = obj")
+            lines.append("    obj._exists = True")
+
+        # Update Pygasus fields.
+        lines += [
+            "    for pygasus in model.__pygasus__.values():",
+            "        pygasus.perform_update("
+            "obj, None, attrs.get(pygasus.name))",
+            "    return obj, others",
+        ]
+
+        source = "\n".join(lines)
+        code = compile(source, f"<hydrator of {model.__name__}>", "exec")
+        exec(code, namespace)
+        return namespace[function_name]
+
     # Type conversions.
     def uuid_from_storage(
         self, model: Model, field: Field, value: str
@@ -1229,8 +1975,8 @@ class SQLStorageEngine(AbstractStorageEngine):
     def _apply_futures(self):
         """Try to apply the futures."""
         for model, pks, key, link_model, link_pks in tuple(self.futures):
-            obj = self.cache.get((model,) + pks)
-            to_link = self.cache.get((link_model,) + link_pks)
+            obj = self.cache.get((model, *pks))
+            to_link = self.cache.get((link_model, *link_pks))
             if obj is not None and to_link is not None:
                 obj._exists = False
                 setattr(obj, key, to_link)
@@ -1258,12 +2004,8 @@ class SQLStorageEngine(AbstractStorageEngine):
             extra = "relationship_on"
             on = field.field_info.extra.get(extra)
             if on is None:
-                model_name = getattr(
-                    model.__config__, "model_name", model.__name__.lower()
-                )
-                back_name = getattr(
-                    f_type.__config__, "model_name", f_type.__name__.lower()
-                )
+                model_name = get_model_name(model)
+                back_name = get_model_name(f_type)
                 model_table = self.tables[model_name]
                 back_table = self.tables[back_name]
                 model_primary_keys = {
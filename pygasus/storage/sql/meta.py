@@ -0,0 +1,396 @@
+# Copyright (c) 2021, LE GOFF Vincent
+# All rights reserved.
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+
+# * Neither the name of ytranslate nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS
+# BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY,
+# OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER
+# IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Per-model metadata, computed once for the SQLAlchemy storage engine."""
+
+import enum
+from sys import intern
+from typing import TYPE_CHECKING, Optional, Tuple, Type
+
+from pydantic.fields import SHAPE_LIST
+from sqlalchemy import bindparam, tuple_
+from sqlalchemy.sql import Select, select
+from sqlalchemy.sql.compiler import Compiled
+
+from pygasus.model import Model
+from pygasus.model.helpers import get_model_name
+
+if TYPE_CHECKING:
+    from pygasus.storage.sql.engine import SQLStorageEngine
+
+# Field kinds.
+SCALAR = 0  # A value stored as is (possibly converted).
+CUSTOM = 1  # A custom field.
+ENUM = 2  # An enumeration, stored as its member value.
+RELATION = 3  # Another model, stored as foreign keys.
+SEQUENCE = 4  # A sequence of models, stored in the other model's table.
+
+
+class ModelMeta:
+
+    """Metadata of a bound model.
+
+    Introspecting `model.__fields__` is costly and its result doesn't
+    change once models are bound.  A `ModelMeta` holds the result
+    of this introspection: field categories, primary keys, the SQL
+    table and the labelled columns to select.  It is created lazily
+    by the storage engine (see `SQLStorageEngine.get_meta`) and
+    discarded whenever a model is bound.
+
+    Attributes:
+        model (subclass of Model): the model class.
+        model_name (str): the model name (also the table name).
+        table (Table): the SQL table of this model.
+        fields (tuple): the (name, field, kind) of every field, in order,
+                `kind` being one of SCALAR, CUSTOM, ENUM, RELATION
+                and SEQUENCE.
+        kinds (dict): the kind of every field, by name.
+        pk_fields (tuple): the (name, field, parameter) of primary keys,
+                `parameter` being the name of the bound parameter
+                filtering on this key (`pk_{name}`).
+        pk_names (tuple): the names of primary keys.
+        int_pk_names (tuple): the names of integer primary keys,
+                generated by the database.
+        rowid_pk (str or None): the name of the primary key if it is
+                the only one and an integer, hence an alias of the
+                SQLite rowid.
+        custom_fields (tuple): the (name, field, custom field) of
+                custom fields.
+        relation_fields (tuple): the (name, field, model, primary keys,
+                index column) of fields pointing to another model,
+                `primary keys` being the (name, field, column) of the
+                linked model's primary keys, `column` being the
+                foreign key column (`{name}_{pk}`), and `index column`
+                the name of the `{name}__index` column when the back
+                field is a list, `None` otherwise.
+        relations (dict): the same relation fields, by name.
+        sequence_names (tuple): the names of sequence fields.
+        enum_names (tuple): the names of enumeration fields.
+        stored_fields (tuple): the (name, field) of fields stored
+                in a column of this model's table.
+        insert_names (tuple): the names of stored fields whose value
+                is sent when inserting a row (all but generated keys).
+        columns (tuple): the labelled columns to select.
+        column_index (dict): the position of each column in a
+                selected row, by label.
+        tables (tuple): the (table, on clause) to join.
+        from_clause (FromClause): the table of this model,
+                outer-joined with every table in `tables`.
+        models (tuple): the models read from a select row, in order.
+        select (Select): the select statement of this model with its
+                joins, without any filter.
+        select_by_pk (Select): the same statement filtered on
+                primary keys, bound to `pk_{name}` parameters.
+        select_many_by_pk (Select): the same statement filtered on
+                a list of primary keys (tuples if the model has several),
+                bound to an expanding `pks` parameter.  None if the model
+                has no primary key.
+        insert (Insert): the insert statement, its values being
+                given at execution time.
+        update (Update): the update statement filtered on primary keys
+                (bound to `pk_{name}` parameters), the columns to
+                update being given at execution time.
+        delete (Delete): the delete statement filtered on primary keys
+                (bound to `pk_{name}` parameters).
+        compiled_select_by_pk (Compiled): `select_by_pk`, compiled
+                for the engine's dialect.
+        compiled_delete (Compiled): `delete`, compiled for the engine's
+                dialect.
+        compiled_inserts (dict): the insert statements compiled
+                for a set of columns, built by `compiled_insert`.
+        compiled_updates (dict): the update statements compiled
+                for a set of columns, built by `compiled_update`.
+        selects_by (dict): the select statements filtered on other
+                columns, built by `select_by`.
+        selects_in (dict): the select statements of rows related to
+                several parents, built by `select_in`.
+        shift_indexes (dict): for each relation with an index column,
+                the update statement adding `delta` to the index of
+                rows of the same parent (bound to `parent_{pk}`
+                parameters) at or after `index`.
+        unshift_indexes (dict): the same update statements,
+                subtracting `delta` from the index of rows at or before
+                `index` (used for negative indexes).
+
+    Column and parameter names are interned, as they are used as
+    keys in every row sent to the database.
+
+    Statements are built once: SQLAlchemy caches their compiled form,
+    so executing them again with other parameters skips compilation.
+    The statements sent for every `get`, `insert`, `update` and `delete` are
+    also compiled beforehand, which skips the cache lookup (and the
+    computation of its key) as well.
+
+    """
+
+    def __init__(self, engine: "SQLStorageEngine", model: Type[Model]):
+        self.model = model
+        self.model_name = get_model_name(model)
+        self.table = engine.tables[self.model_name]
+
+        fields = []
+        pk_fields = []
+        int_pk_names = []
+        custom_fields = []
+        relation_fields = []
+        sequence_names = []
+        enum_names = []
+        stored_fields = []
+        for name, field in model.__fields__.items():
+            info = field.field_info
+            f_type = field.type_
+            if info.extra.get("sequence", False):
+                fields.append((name, field, SEQUENCE))
+                sequence_names.append(name)
+                continue
+
+            if info.extra.get("primary_key", False):
+                pk_fields.append((name, field, intern(f"pk_{name}")))
+                if issubclass(f_type, int):
+                    int_pk_names.append(name)
+
+            custom = engine.custom_fields.get((model, name))
+            if custom:
+                fields.append((name, field, CUSTOM))
+                custom_fields.append((name, field, custom))
+            elif issubclass(f_type, Model):
+                fields.append((name, field, RELATION))
+                primary_keys = tuple(
+                    (pname, pfield, intern(f"{name}_{pname}"))
+                    for pname, pfield in f_type.__fields__.items()
+                    if pfield.field_info.extra.get("primary_key")
+                )
+                back = engine.get_back_field(model, field, f_type)
+                index_column = None
+                if back.shape == SHAPE_LIST:
+                    index_column = intern(f"{name}__index")
+
+                relation_fields.append(
+                    (name, field, f_type, primary_keys, index_column)
+                )
+                continue
+            elif issubclass(f_type, enum.Enum):
+                fields.append((name, field, ENUM))
+                enum_names.append(name)
+            else:
+                fields.append((name, field, SCALAR))
+
+            stored_fields.append((name, field))
+
+        self.fields = tuple(fields)
+        self.kinds = {name: kind for name, _, kind in fields}
+        self.pk_fields = tuple(pk_fields)
+        self.pk_names = tuple(name for name, _, _ in pk_fields)
+        self.int_pk_names = tuple(int_pk_names)
+        self.rowid_pk = None
+        if len(pk_fields) == 1 and int_pk_names:
+            self.rowid_pk = int_pk_names[0]
+        self.custom_fields = tuple(custom_fields)
+        self.relation_fields = tuple(relation_fields)
+        self.relations = {entry[0]: entry for entry in relation_fields}
+        self.sequence_names = tuple(sequence_names)
+        self.enum_names = tuple(enum_names)
+        self.stored_fields = tuple(stored_fields)
+        self.insert_names = tuple(
+            name for name, _ in stored_fields if name not in int_pk_names
+        )
+
+        columns, tables = engine._get_columns_for(model, set())
+        self.columns = tuple(columns)
+        self.column_index = {
+            column.name: index for index, column in enumerate(columns)
+        }
+        self.tables = tuple(tables)
+        self.models = (model,) + tuple(
+            engine.models[table.name] for table, _ in tables
+        )
+
+        # Build the statements.
+        table = self.table
+        by_pk = [
+            getattr(table.c, name) == bindparam(param)
+            for name, _, param in self.pk_fields
+        ]
+        from_clause = table
+        for join, on in self.tables:
+            from_clause = from_clause.outerjoin(join, on)
+        self.from_clause = from_clause
+        self.select = select(*self.columns).select_from(from_clause)
+        self.select_by_pk = self.select.where(*by_pk)
+        self.select_many_by_pk = None
+        pk_columns = [getattr(table.c, name) for name in self.pk_names]
+        if pk_columns:
+            if len(pk_columns) == 1:
+                pk_column = pk_columns[0]
+            else:
+                pk_column = tuple_(*pk_columns)
+            self.select_many_by_pk = self.select.where(
+                pk_column.in_(bindparam("pks", expanding=True))
+            )
+        self.insert = table.insert()
+        self.update = table.update().where(*by_pk)
+        self.delete = table.delete().where(*by_pk)
+        self.dialect = engine.engine.dialect
+        self.compiled_select_by_pk = self.select_by_pk.compile(
+            dialect=self.dialect
+        )
+        self.compiled_delete = self.delete.compile(dialect=self.dialect)
+        self.compiled_inserts = {}
+        self.compiled_updates = {}
+        self.selects_by = {}
+        self.selects_in = {}
+        self.shift_indexes = {}
+        self.unshift_indexes = {}
+        for name, _, _, primary_keys, index_column in self.relation_fields:
+            if index_column:
+                column = getattr(table.c, index_column)
+                same_parent = [
+                    getattr(table.c, fk) == bindparam(f"parent_{pk}")
+                    for pk, _, fk in primary_keys
+                ]
+                self.shift_indexes[name] = (
+                    table.update()
+                    .where(column >= bindparam("index"), *same_parent)
+                    .values({column: column + bindparam("delta")})
+                )
+                self.unshift_indexes[name] = (
+                    table.update()
+                    .where(column <= bindparam("index"), *same_parent)
+                    .values({column: column - bindparam("delta")})
+                )
+
+    def compiled_insert(self, names: Tuple[str]) -> Compiled:
+        """Return the insert statement compiled for these columns.
+
+        The statement is compiled the first time these columns are
+        asked for, then reused.
+
+        Args:
+            names (tuple of str): the names of the columns to insert.
+
+        Returns:
+            compiled (Compiled): the compiled insert statement.
+
+        """
+        compiled = self.compiled_inserts.get(names)
+        if compiled is None:
+            compiled = self.insert.compile(
+                dialect=self.dialect, column_keys=list(names)
+            )
+            self.compiled_inserts[names] = compiled
+
+        return compiled
+
+    def compiled_update(self, names: Tuple[str]) -> Compiled:
+        """Return the update statement compiled for these columns.
+
+        The statement is compiled the first time these columns are
+        asked for, then reused.
+
+        Args:
+            names (tuple of str): the names of the columns to update.
+
+        Returns:
+            compiled (Compiled): the compiled update statement.
+
+        """
+        compiled = self.compiled_updates.get(names)
+        if compiled is None:
+            compiled = self.update.compile(
+                dialect=self.dialect, column_keys=list(names)
+            )
+            self.compiled_updates[names] = compiled
+
+        return compiled
+
+    def select_by(
+        self, names: Tuple[str], order_by: Optional[str] = None
+    ) -> Select:
+        """Return the select statement filtered on these columns.
+
+        The statement is built the first time these columns are
+        asked for, then reused.
+
+        Args:
+            names (tuple of str): the column names, each bound to
+                    a `by_{name}` parameter.
+            order_by (str, optional): the name of the column by which
+                    to order rows.
+
+        Returns:
+            select (Select): the filtered select statement.
+
+        """
+        statement = self.selects_by.get((names, order_by))
+        if statement is None:
+            table = self.table
+            statement = self.select.where(
+                *(
+                    getattr(table.c, name) == bindparam(f"by_{name}")
+                    for name in names
+                )
+            )
+            if order_by is not None:
+                statement = statement.order_by(getattr(table.c, order_by))
+            self.selects_by[(names, order_by)] = statement
+
+        return statement
+
+    def select_in(self, name: str) -> Select:
+        """Return the select statement of rows related to several parents.
+
+        The statement is filtered on the foreign keys of a relation,
+        bound to an expanding `parents` parameter (a list of primary
+        keys, as tuples if the parent has several).  Rows are ordered
+        by parent, then by index in the parent's sequence.
+
+        Args:
+            name (str): the name of the relation field.
+
+        Returns:
+            select (Select): the filtered select statement.
+
+        """
+        statement = self.selects_in.get(name)
+        if statement is None:
+            table = self.table
+            _, _, _, primary_keys, index_column = self.relations[name]
+            columns = [getattr(table.c, fk) for _, _, fk in primary_keys]
+            if len(columns) == 1:
+                parent = columns[0]
+            else:
+                parent = tuple_(*columns)
+            statement = self.select.where(
+                parent.in_(bindparam("parents", expanding=True))
+            ).order_by(*columns)
+            if index_column is not None:
+                statement = statement.order_by(getattr(table.c, index_column))
+            self.selects_in[name] = statement
+
+        return statement
@@ -29,67 +29,148 @@
 
 """SQLAlchemy query builder."""
 
+from enum import Enum
+import operator
+
+from sqlalchemy import literal
+from sqlalchemy.sql.operators import ColumnOperators
+
+from pygasus.model.helpers import get_model_name
 from pygasus.storage.query_builder import AbstractQueryBuilder
 
+# Return the (model, field name) key under which a field is cached.
+_field_key = operator.attrgetter("__model__", "name")
+
+
+def _predicate(apply, doc, many=False):
+    """Return a query builder method applying an operator to a column.
+
+    Args:
+        apply (callable): the operator, called with the field column
+                and the other operand.
+        doc (str): the docstring of the method.
+        many (bool): whether the other operand is a collection,
+                whose values are converted one by one.
+
+    Returns:
+        method (function): the query builder method.
+
+    """
+
+    # The column is read on the field directly, `_get_column` is only
+    # called for fields that haven't been bound to a table yet.
+    if many:
+
+        def method(self, field, other):
+            column = field.__column__
+            if column is None:
+                column = self._get_column(field)
+
+            to_storage = self._to_storage
+            return apply(column, [to_storage(field, value) for value in other])
+
+    else:
+
+        def method(self, field, other):
+            column = field.__column__
+            if column is None:
+                column = self._get_column(field)
+
+            return apply(column, self._to_storage(field, other))
+
+    method.__doc__ = doc
+    return method
+
 
 class SQLQueryBuilder(AbstractQueryBuilder):
 
-    """Query builder for SQLAlchemy."""
-
-    def _get_table(self, field):
-        """Return the table for this model."""
-        model = field.__model__
-        model_name = getattr(
-            model.__config__, "model_name", model.__name__.lower()
-        )
-        return self.storage_engine.tables[model_name]
-
-    def eq(self, field, other):
-        """Compare field to other."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name) == other
-
-    def ne(self, field, other):
-        """Compare field to other."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name) != other
-
-    def lt(self, field, other):
-        """Compare field to other."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name) < other
-
-    def le(self, field, other):
-        """Compare field to other."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name) <= other
-
-    def gt(self, field, other):
-        """Compare field to other."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name) > other
-
-    def ge(self, field, other):
-        """Compare field to other."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name) >= other
-
-    def is_in(self, field, collection):
-        """Filter fields with a value in a collection."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name).in_(collection)
-
-    def is_not_in(self, field, collection):
-        """Filter fields with a value not in a collection."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name).not_in(collection)
+    """Query builder for SQLAlchemy.
+
+    Columns are attached to fields when models are bound, so most
+    predicates read them directly.  Bitwise and operators (used
+    by flags) are cached by model and field name, the cache is
+    cleared whenever a model is bound.
+
+    """
+
+    __slots__ = ("bitands", "converters")
+
+    def __init__(self, storage_engine):
+        super().__init__(storage_engine)
+        self.bitands = {}
+
+        # The dictionary is updated in place by `add_converter`.
+        self.converters = storage_engine.to_storage_converters
+
+    def clear_cache(self):
+        """Forget cached operators, as models are bound again."""
+        self.bitands.clear()
+
+    def _get_column(self, field):
+        """Return the column of this field."""
+        column = field.__column__
+        if column is None:
+            table = self.storage_engine.tables[get_model_name(field.__model__)]
+            column = field.__column__ = table.c[field.name]
+
+        return column
+
+    def _to_storage(self, field, value):
+        """Convert a value compared to this field, as it is stored.
+
+        Enumeration members are stored as their value, other types
+        may have a storage converter (UUIDs are stored as strings).
+
+        Args:
+            field (PygasusField): the field compared to the value.
+            value (any): the value.
+
+        Returns:
+            value (any): the value to bind in the query.
+
+        """
+        if isinstance(value, Enum):
+            return value.value
+
+        model_field = field.__field__
+        method = self.converters.get(model_field.outer_type_)
+        if method is not None and value is not None:
+            value = method(field.__model__, model_field, value)
+
+        return value
+
+    def _get_bitand(self, field):
+        """Return the bitwise and operator applied to this field."""
+        key = _field_key(field)
+        bitand = self.bitands.get(key)
+        if bitand is None:
+            bitand = self.bitands[key] = self._get_column(field).op("&")
+
+        return bitand
+
+    eq = _predicate(operator.eq, "Compare field to other.")
+    ne = _predicate(operator.ne, "Compare field to other.")
+    lt = _predicate(operator.lt, "Compare field to other.")
+    le = _predicate(operator.le, "Compare field to other.")
+    gt = _predicate(operator.gt, "Compare field to other.")
+    ge = _predicate(operator.ge, "Compare field to other.")
+    is_in = _predicate(
+        ColumnOperators.in_,
+        "Filter fields with a value in a collection.",
+        many=True,
+    )
+    is_not_in = _predicate(
+        ColumnOperators.not_in,
+        "Filter fields with a value not in a collection.",
+        many=True,
+    )
 
     def has(self, field, value):
         """Return models with the field having this value (flag)."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name).op("&")(value.value) == value.value
+        value = literal(value.value)
+        return self._get_bitand(field)(value) == value
 
     def has_not(self, field, value):
         """Return models without the field having this value (flag)."""
-        table = self._get_table(field)
-        return getattr(table.c, field.name).op("&")(value.value) != value.value
+        value = literal(value.value)
+        return self._get_bitand(field)(value) != value
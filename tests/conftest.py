@@ -3,9 +3,22 @@ import pytest
 from pygasus.storage import SQLStorageEngine
 
 
-@pytest.fixture(scope="function")
-def db():
+@pytest.fixture(scope="module")
+def storage():
+    """Storage engine shared by the tests of a module.
+
+    Test modules define their own models, sometimes with the same
+    names, so the storage engine can't be shared across modules.
+
+    """
     engine = SQLStorageEngine()
     engine.init(memory=True, logging=False)
     yield engine
     engine.destroy()
+
+
+@pytest.fixture(scope="function")
+def db(storage):
+    yield storage
+    storage.truncate()
+    storage.logging = False
@@ -15,8 +15,12 @@ class CustomDict(dict):
         self.field = None
 
     def __setitem__(self, key, value):
+        old = self.get(key, ...)
         super().__setitem__(key, value)
-        self.save()
+
+        # Don't save if the value hasn't changed.
+        if old is ... or (old is not value and old != value):
+            self.save()
 
     def save(self):
         """Save the dictionary into the parent."""
@@ -51,7 +55,7 @@ class DictField(CustomField):
             It must be of the same type as returned by `add`.
 
         """
-        return pickle.dumps(dict(value))
+        return pickle.dumps(dict(value), pickle.HIGHEST_PROTOCOL)
 
     def to_field(self, value: bytes):
         """Convert the stored value to the field value.
@@ -163,6 +167,27 @@ def test_create_account_with_default_options_and_update_them(db):
     assert account is account.options.parent
 
 
+def test_update_options_with_the_same_value(db):
+    """Setting an option to its current value doesn't save it again."""
+    db.bind({Account})
+    db.add_custom_field(DictField)
+
+    # Create an account.
+    account = Account.repository.create(name="test", options={"key": 1})
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(statement)
+    account.options["key"] = 1
+    assert statements == []
+    account.options["key"] = 2
+    assert len(statements) == 1
+    db.logging = False
+
+    # Retrieve from the storage.
+    db.cache.clear()
+    account = Account.repository.get(id=account.id)
+    assert account.options == {"key": 2}
+
+
 def test_create_account_in_pickled_options(db):
     """Create a simple account and save it in another."""
     db.bind({Account})
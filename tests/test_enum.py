@@ -128,12 +128,11 @@ def test_create_int_enum_and_retrieve_it(db):
     """Create a NTile object."""
     db.bind({NTile})
 
-    tiles = []
-    for member in NColor:
-        if member is NColor.INVALID:
-            continue
-
-        tiles.append(NTile.repository.create(x=0, y=0, color=member))
+    tiles = NTile.repository.create_many(
+        {"x": 0, "y": 0, "color": member}
+        for member in NColor
+        if member is not NColor.INVALID
+    )
 
     # Retrieve them.
     db.cache.clear()
@@ -146,12 +145,11 @@ def test_create_str_enum_and_retrieve_it(db):
     """Create a NTile object."""
     db.bind({STile})
 
-    tiles = []
-    for member in SColor:
-        if member is SColor.INVALID:
-            continue
-
-        tiles.append(STile.repository.create(x=0, y=0, color=member))
+    tiles = STile.repository.create_many(
+        {"x": 0, "y": 0, "color": member}
+        for member in SColor
+        if member is not SColor.INVALID
+    )
 
     # Retrieve them.
     db.cache.clear()
@@ -164,12 +162,11 @@ def test_create_flag_and_retrieve_it(db):
     """Create a User object."""
     db.bind({User})
 
-    users = []
-    for member in Access:
-        if member is Access.INVALID:
-            continue
-
-        users.append(User.repository.create(name="me", access=member))
+    users = User.repository.create_many(
+        {"name": "me", "access": member}
+        for member in Access
+        if member is not Access.INVALID
+    )
 
     # Retrieve them.
     db.cache.clear()
@@ -183,12 +180,11 @@ def test_create_flag_and_retrieve_if_in(db):
     """Create a User object."""
     db.bind({User})
 
-    users = []
-    for member in Access:
-        if member is Access.INVALID:
-            continue
-
-        users.append(User.repository.create(name="me", access=member))
+    User.repository.create_many(
+        {"name": "me", "access": member}
+        for member in Access
+        if member is not Access.INVALID
+    )
 
     # Retrieve the ones with the READ flag.
     db.cache.clear()
@@ -202,12 +198,11 @@ def test_create_flag_and_retrieve_if_not_in(db):
     """Create a User object."""
     db.bind({User})
 
-    users = []
-    for member in Access:
-        if member is Access.INVALID:
-            continue
-
-        users.append(User.repository.create(name="me", access=member))
+    User.repository.create_many(
+        {"name": "me", "access": member}
+        for member in Access
+        if member is not Access.INVALID
+    )
 
     # Retrieve the ones with the READ flag.
     db.cache.clear()
@@ -257,3 +252,49 @@ def test_create_flag_update_and_retrieve_it(db):
     assert user.access & Access.WRITE
     assert not user.access & Access.EXECUTE
 
+
+def test_flag_select_uses_the_statement_cache(db):
+    """Build the same flag filter twice, the second is compiled once."""
+    db.bind({User})
+    User.repository.create(name="me", access=Access.READ)
+
+    hits = []
+    for member in (Access.READ, Access.READ, Access.WRITE):
+        query = db.get_meta(User).select.where(User.access.has(member))
+        result = db.connection.execute(query)
+        hits.append(result.context.cache_hit)
+        result.close()
+
+    # Flag values are bound, other values reuse the same statement.
+    assert hits[1] == result.context.dialect.CACHE_HIT
+    assert hits[2] == result.context.dialect.CACHE_HIT
+
+
+def test_create_int_enum_and_select_it(db):
+    """Create NTile objects and select them by color."""
+    db.bind({NTile})
+    NTile.repository.create(x=0, y=0, color=NColor.RED)
+    NTile.repository.create(x=1, y=0, color=NColor.BLUE)
+    NTile.repository.create(x=2, y=0, color=NColor.RED)
+
+    # Select by enumeration member.
+    db.cache.clear()
+    tiles = NTile.repository.select(NTile.color == NColor.RED)
+    assert sorted(tile.x for tile in tiles) == [0, 2]
+    tiles = NTile.repository.select(
+        NTile.color.is_in((NColor.BLUE, NColor.BLACK))
+    )
+    assert [tile.x for tile in tiles] == [1]
+
+
+def test_retrieve_unknown_enum_value_as_invalid(db):
+    """A stored value matching no member is read as the invalid member."""
+    db.bind({NTile})
+    tile = NTile.repository.create(x=0, y=0, color=NColor.RED)
+    table = db.tables["ntile"]
+    db.connection.execute(table.update().values(color=99))
+
+    # Retrieve it.
+    db.cache.clear()
+    tile = NTile.repository.get(id=tile.id)
+    assert tile.color is NColor.INVALID
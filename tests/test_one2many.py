@@ -62,6 +62,25 @@ def test_create_two_lists(db):
     assert oliver in dickens.books
 
 
+def test_contains_after_clearing_the_cache(db):
+    """Check membership of a book read again after clearing the cache."""
+    db.bind({Author, Book})
+    dickens = Author.repository.create(
+        first_name="Charles",
+        last_name="Dickens",
+        born_in=1812,
+    )
+    carol = dickens.books.append_new(
+        title="A Christmas Carol",
+        year=1843,
+    )
+    db.cache.clear()
+    same = Book.repository.get(id=carol.id)
+    assert same is not carol
+    assert same == carol
+    assert same in dickens.books
+
+
 def test_create_and_change_author(db):
     """Create authors and books and change books."""
     db.bind({Author, Book})
@@ -181,6 +200,14 @@ def test_representations(db):
     )
     assert isinstance(str(dickens.books), str)
     assert isinstance(repr(dickens.books), str)
+    assert str(dickens.books) == f"[Book(id={carol.id}), Book(id={oliver.id})]"
+
+    # Only the first books of a long list are represented.
+    dickens.books.extend_new(
+        [{"title": f"Volume {i}", "year": 1850} for i in range(10)]
+    )
+    assert repr(dickens.books).count("<Book(") == 10
+    assert repr(dickens.books).endswith(", ... (2 more)]")
 
 
 def test_list_order(db):
@@ -215,14 +242,81 @@ def test_list_order(db):
     dickens_books = []
     for book in dickens_titles:
         dickens_books.insert(0, dickens.books.insert_new(0, **book))
-    london_books = []
-    for book in london_titles:
-        london_books.insert(0, london.books.insert_new(0, **book))
+    london_books = london.books.extend_new(london_titles)
 
     # Make sure order is identical.
     db.cache.clear()
     dickens = Author.repository.get(id=dickens.id)
     assert dickens.books == dickens_books
+    london = Author.repository.get(id=london.id)
+    assert london.books == london_books
+    assert [book.title for book in london.books] == [
+        book["title"] for book in london_titles
+    ]
+
+
+def test_list_order_with_insert_many_new(db):
+    """Insert books by batches and check their order is retained."""
+    db.bind({Author, Book})
+    dickens = Author.repository.create(
+        first_name="Charles",
+        last_name="Dickens",
+        born_in=1812,
+    )
+
+    # Insert a first batch, then a second one in the middle.
+    first = dickens.books.insert_many_new(
+        0,
+        [
+            {"title": "The Pickwick Papers", "year": 1836},
+            {"title": "Barnaby Rudge", "year": 1841},
+        ],
+    )
+    second = dickens.books.insert_many_new(
+        -1,
+        [
+            {"title": "Oliver Twist", "year": 1837},
+            {"title": "Nicholas Nickleby", "year": 1838},
+        ],
+    )
+    dickens_books = [first[0], *second, first[1]]
+    assert dickens.books == dickens_books
+
+    # Make sure order is identical in the storage.
+    db.cache.clear()
+    dickens = Author.repository.get(id=dickens.id)
+    assert dickens.books == dickens_books
+
+
+def test_extend_new(db):
+    """Append several new books at once, keeping their order."""
+    db.bind({Author, Book})
+    dickens = Author.repository.create(
+        first_name="Charles",
+        last_name="Dickens",
+        born_in=1812,
+    )
+    carol = dickens.books.append_new(
+        title="A Christmas Carol",
+        year=1843,
+    )
+    oliver, nickleby = dickens.books.extend_new(
+        [
+            {"title": "Oliver Twist", "year": 1837},
+            {"title": "Nicholas Nickleby", "year": 1838},
+        ]
+    )
+    assert oliver.author is dickens
+    assert dickens.books == [carol, oliver, nickleby]
+
+    # Make sure order is identical in storage.
+    db.cache.clear()
+    dickens = Author.repository.get(id=dickens.id)
+    assert [book.title for book in dickens.books] == [
+        "A Christmas Carol",
+        "Oliver Twist",
+        "Nicholas Nickleby",
+    ]
 
 
 class Character(Model):
@@ -274,3 +368,92 @@ def test_move_character(db):
     assert character.room is None
     assert room1.characters == []
     assert room2.characters == []
+
+
+def test_select_and_load_books(db):
+    """Select authors and load their books in a single query."""
+    db.bind({Author, Book})
+    dickens = Author.repository.create(
+        first_name="Charles",
+        last_name="Dickens",
+        born_in=1812,
+    )
+    dickens.books.append_new(title="Oliver Twist", year=1837)
+    dickens.books.append_new(title="A Christmas Carol", year=1843)
+    Author.repository.create(
+        first_name="Victor",
+        last_name="Hugo",
+        born_in=1802,
+    )
+    db.cache.clear()
+    del dickens
+
+    # Select authors and load their books.
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(statement)
+    authors = Author.repository.select(Author.born_in > 1800, load=("books",))
+    authors = {author.last_name: author for author in authors}
+    assert [book.title for book in authors["Dickens"].books] == [
+        "Oliver Twist",
+        "A Christmas Carol",
+    ]
+    assert all(
+        book.author is authors["Dickens"] for book in authors["Dickens"].books
+    )
+    assert len(authors["Hugo"].books) == 0
+    assert len(statements) == 2
+
+
+def test_list_order_uses_index(db):
+    """Books of an author are read in order through an index."""
+    db.bind({Author, Book})
+    dickens = Author.repository.create(
+        first_name="Charles",
+        last_name="Dickens",
+        born_in=1812,
+    )
+    dickens.books.append_new(title="Oliver Twist", year=1837)
+    dickens.books.insert_new(0, title="The Pickwick Papers", year=1836)
+    db.cache.clear()
+    dickens = Author.repository.get(id=dickens.id)
+
+    # Read the query plan of the query loading the books.
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(
+        (statement, parameters)
+    )
+    assert [book.year for book in dickens.books] == [1836, 1837]
+    db.logging = False
+    ((statement, parameters),) = statements
+    plan = " ".join(
+        row[-1]
+        for row in db.connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+    )
+    assert "idx_book_author__index" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_update_fields_with_a_sequence(db):
+    """Update fields, trying to replace a sequence."""
+    db.bind({Author, Book})
+    dickens = Author.repository.create(
+        first_name="Charles",
+        last_name="Dickens",
+        born_in=1812,
+    )
+    carol = dickens.books.append_new(
+        title="A Christmas Carol",
+        year=1843,
+    )
+    with pytest.raises(ValueError):
+        Author.repository.update_fields(dickens, first_name="C.", books=[])
+    assert dickens.first_name == "Charles"
+    assert carol in dickens.books
+
+    # Clear the cache and retrieve the same author.
+    db.cache.clear()
+    dickens = Author.repository.get(id=dickens.id)
+    assert dickens.first_name == "Charles"
+    assert [book.id for book in dickens.books] == [carol.id]
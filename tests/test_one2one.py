@@ -320,6 +320,32 @@ def test_create_and_update_to_check_ownership(db):
     assert s2.account is a2
 
 
+def test_update_from_both_sides_to_check_ownership(db):
+    """Update links from either side with a single query."""
+    db.bind({Session, Account})
+    session = Session.repository.create(name="session1")
+    account = Account.repository.create(admin=True)
+
+    # Link and unlink from the session, which doesn't own the link.
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(statement)
+    session.account = account
+    assert account.session is session
+    session.account = None
+    assert account.session is None
+    assert session.account is None
+    assert len(statements) == 2
+    assert all(
+        statement.startswith("UPDATE account") for statement in statements
+    )
+
+    # Check the storage.
+    session.account = account
+    db.cache.clear()
+    account = Account.repository.get(id=account.id)
+    assert account.session.name == "session1"
+
+
 def test_create_and_delete_to_check_ownership(db):
     """Create and delete accounts and sessions."""
     db.bind({Session, Account})
@@ -340,3 +366,32 @@ def test_create_and_delete_to_check_ownership(db):
     assert s2.account is None
     Session.repository.delete(s1)
     assert a1.session is None
+
+
+def test_update_fields_leaves_the_author_unchanged_on_failure(db):
+    """Update fields with a relation that can't be updated."""
+    db.bind({Author, Book})
+    dickens = Author.repository.create(
+        first_name="Charles",
+        last_name="Dickens",
+        born_in=1812,
+    )
+    carol = Book.repository.create(
+        title="A Christmas Carol",
+        year=1843,
+        author=dickens,
+    )
+    with pytest.raises(ValueError):
+        Author.repository.update_fields(dickens, first_name="C.", book=42)
+
+    # The book requires an author, it can't be removed.
+    with pytest.raises(ValueError):
+        Author.repository.update_fields(dickens, first_name="C.", book=None)
+    assert dickens.first_name == "Charles"
+    assert dickens.book is carol
+
+    # Clear the cache and retrieve the same author.
+    db.cache.clear()
+    dickens = Author.repository.get(id=dickens.id)
+    assert dickens.first_name == "Charles"
+    assert dickens.book.id == carol.id
@@ -1,9 +1,10 @@
 from datetime import datetime
-from io import StringIO
-import sys
+import logging
 from typing import Optional
 
 from pydantic import EmailStr
+import pytest
+from sqlalchemy.exc import IntegrityError
 
 from pygasus.model import Field, Model
 
@@ -13,14 +14,14 @@ class User(Model):
     """A simple user."""
 
     id: int = Field(primary_key=True)
-    name: str
-    age: int
+    name: str = Field(index=True)
+    age: int = Field(index=True)
     height: float
     creation: datetime = Field(default_factory=datetime.utcnow)
     email: Optional[EmailStr] = Field(None, index=True, unique=True)
 
 
-def test_log(db):
+def test_log(db, caplog):
     """Create a user testing logs."""
     db.bind({User})
     messages = []
@@ -28,20 +29,23 @@ def test_log(db):
         messages.append((statement, args))
 
     db.logging = log
-    user = User.repository.create(name="Vincent", age=33, height=5.7)
+    User.repository.create(name="Vincent", age=33, height=5.7)
 
     # Check that the log function was called.
     assert len(messages) > 0
 
-    # Test the default mprint log.
-    db.logging = True # same as db.logging = print
-    standard = StringIO()
-    stdout = sys.stdout
-    sys.stdout = standard
-    user = User.repository.create(name="Vincent", age=33, height=5.7)
-    sys.stdout = stdout
-    standard.seek(0)
-    assert len(standard.read()) > 1
+    # Test the default log, sent to the pygasus.sql logger.
+    db.logging = True
+    with caplog.at_level(logging.DEBUG, logger="pygasus.sql"):
+        User.repository.create(name="Vincent", age=33, height=5.7)
+    assert any("INSERT" in record.getMessage() for record in caplog.records)
+
+    # Disabled logging shouldn't log anything.
+    caplog.clear()
+    db.logging = False
+    with caplog.at_level(logging.DEBUG, logger="pygasus.sql"):
+        User.repository.create(name="Vincent", age=33, height=5.7)
+    assert not caplog.records
 
 
 def test_create(db):
@@ -82,21 +86,51 @@ def test_create_and_retrieve_with_a_clean_cache(db):
     assert user.email == retrieved.email
 
 
-def test_create_and_select_equal(db):
-    """Create users and search in the storage through queries."""
+def test_create_many_and_retrieve_with_a_clean_cache(db):
+    """Create several users at once and retrieve them from the storage."""
     db.bind({User})
     user1 = User.repository.create(name="Vincent", age=33, height=5.7)
-    user2 = User.repository.create(
-        name="Muriel",
-        age=33,
-        height=5.6,
-        email="muriel@test.com",
+    user2, user3 = User.repository.create_many(
+        [
+            dict(name="Muriel", age=33, height=5.6, email="muriel@test.com"),
+            dict(name="Jack", age=21, height=5.9),
+        ]
     )
-    user3 = User.repository.create(
-        name="Vincent",
-        age=21,
-        height=5.7,
-        email="vincent@test.com",
+    assert user2.id == user1.id + 1
+    assert user3.id == user1.id + 2
+    assert User.repository.get(id=user2.id) is user2
+
+    # Clear the cache and retrieve the same users in a single query.
+    db.cache.clear()
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(statement)
+    retrieved2, retrieved3 = User.repository.get_many([user2.id, user3.id])
+    assert len(statements) == 1
+    assert retrieved3.name == "Jack"
+    assert retrieved3.email is None
+    assert retrieved2.email == "muriel@test.com"
+    assert User.repository.get(id=user2.id) is retrieved2
+
+
+def test_create_and_select_equal(db):
+    """Create users and search in the storage through queries."""
+    db.bind({User})
+    user1, user2, user3 = User.repository.create_many(
+        [
+            dict(name="Vincent", age=33, height=5.7),
+            dict(
+                name="Muriel",
+                age=33,
+                height=5.6,
+                email="muriel@test.com",
+            ),
+            dict(
+                name="Vincent",
+                age=21,
+                height=5.7,
+                email="vincent@test.com",
+            ),
+        ]
     )
 
     # Select users.
@@ -109,18 +143,22 @@ def test_create_and_select_equal(db):
 def test_create_and_select_different(db):
     """Create users and search in the storage through queries."""
     db.bind({User})
-    user1 = User.repository.create(name="Vincent", age=33, height=5.7)
-    user2 = User.repository.create(
-        name="Muriel",
-        age=33,
-        height=5.6,
-        email="muriel@test.com",
-    )
-    user3 = User.repository.create(
-        name="Vincent",
-        age=21,
-        height=5.7,
-        email="vincent@test.com",
+    user1, user2, user3 = User.repository.create_many(
+        [
+            dict(name="Vincent", age=33, height=5.7),
+            dict(
+                name="Muriel",
+                age=33,
+                height=5.6,
+                email="muriel@test.com",
+            ),
+            dict(
+                name="Vincent",
+                age=21,
+                height=5.7,
+                email="vincent@test.com",
+            ),
+        ]
     )
 
     # Select users.
@@ -133,18 +171,22 @@ def test_create_and_select_different(db):
 def test_create_and_select_lower_than(db):
     """Create users and search in the storage through queries."""
     db.bind({User})
-    user1 = User.repository.create(name="Vincent", age=33, height=5.7)
-    user2 = User.repository.create(
-        name="Muriel",
-        age=32,
-        height=5.6,
-        email="muriel@test.com",
-    )
-    user3 = User.repository.create(
-        name="Vincent",
-        age=21,
-        height=5.7,
-        email="vincent@test.com",
+    user1, user2, user3 = User.repository.create_many(
+        [
+            dict(name="Vincent", age=33, height=5.7),
+            dict(
+                name="Muriel",
+                age=32,
+                height=5.6,
+                email="muriel@test.com",
+            ),
+            dict(
+                name="Vincent",
+                age=21,
+                height=5.7,
+                email="vincent@test.com",
+            ),
+        ]
     )
 
     # Select users.
@@ -157,18 +199,22 @@ def test_create_and_select_lower_than(db):
 def test_create_and_select_lower_or_equal(db):
     """Create users and search in the storage through queries."""
     db.bind({User})
-    user1 = User.repository.create(name="Vincent", age=33, height=5.7)
-    user2 = User.repository.create(
-        name="Muriel",
-        age=32,
-        height=5.6,
-        email="muriel@test.com",
-    )
-    user3 = User.repository.create(
-        name="Vincent",
-        age=21,
-        height=5.7,
-        email="vincent@test.com",
+    user1, user2, user3 = User.repository.create_many(
+        [
+            dict(name="Vincent", age=33, height=5.7),
+            dict(
+                name="Muriel",
+                age=32,
+                height=5.6,
+                email="muriel@test.com",
+            ),
+            dict(
+                name="Vincent",
+                age=21,
+                height=5.7,
+                email="vincent@test.com",
+            ),
+        ]
     )
 
     # Select users.
@@ -181,18 +227,22 @@ def test_create_and_select_lower_or_equal(db):
 def test_create_and_select_greater_than(db):
     """Create users and search in the storage through queries."""
     db.bind({User})
-    user1 = User.repository.create(name="Vincent", age=33, height=5.7)
-    user2 = User.repository.create(
-        name="Muriel",
-        age=32,
-        height=5.6,
-        email="muriel@test.com",
-    )
-    user3 = User.repository.create(
-        name="Vincent",
-        age=21,
-        height=5.7,
-        email="vincent@test.com",
+    user1, user2, user3 = User.repository.create_many(
+        [
+            dict(name="Vincent", age=33, height=5.7),
+            dict(
+                name="Muriel",
+                age=32,
+                height=5.6,
+                email="muriel@test.com",
+            ),
+            dict(
+                name="Vincent",
+                age=21,
+                height=5.7,
+                email="vincent@test.com",
+            ),
+        ]
     )
 
     # Select users.
@@ -205,18 +255,22 @@ def test_create_and_select_greater_than(db):
 def test_create_and_select_greater_or_equal(db):
     """Create users and search in the storage through queries."""
     db.bind({User})
-    user1 = User.repository.create(name="Vincent", age=33, height=5.7)
-    user2 = User.repository.create(
-        name="Muriel",
-        age=32,
-        height=5.6,
-        email="muriel@test.com",
-    )
-    user3 = User.repository.create(
-        name="Vincent",
-        age=21,
-        height=5.7,
-        email="vincent@test.com",
+    user1, user2, user3 = User.repository.create_many(
+        [
+            dict(name="Vincent", age=33, height=5.7),
+            dict(
+                name="Muriel",
+                age=32,
+                height=5.6,
+                email="muriel@test.com",
+            ),
+            dict(
+                name="Vincent",
+                age=21,
+                height=5.7,
+                email="vincent@test.com",
+            ),
+        ]
     )
 
     # Select users.
@@ -229,18 +283,22 @@ def test_create_and_select_greater_or_equal(db):
 def test_create_and_select_is_in(db):
     """Create users and search in the storage through queries."""
     db.bind({User})
-    user1 = User.repository.create(name="Vincent", age=33, height=5.7)
-    user2 = User.repository.create(
-        name="Muriel",
-        age=32,
-        height=5.6,
-        email="muriel@test.com",
-    )
-    user3 = User.repository.create(
-        name="Vincent",
-        age=21,
-        height=5.7,
-        email="vincent@test.com",
+    user1, user2, user3 = User.repository.create_many(
+        [
+            dict(name="Vincent", age=33, height=5.7),
+            dict(
+                name="Muriel",
+                age=32,
+                height=5.6,
+                email="muriel@test.com",
+            ),
+            dict(
+                name="Vincent",
+                age=21,
+                height=5.7,
+                email="vincent@test.com",
+            ),
+        ]
     )
 
     # Select users.
@@ -250,6 +308,64 @@ def test_create_and_select_is_in(db):
     assert user3 not in result
 
 
+def test_select_uses_index(db):
+    """Select users on their age or name through indexes."""
+    db.bind({User})
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(
+        (statement, parameters)
+    )
+    User.repository.select((User.age >= 18) & (User.age < 33))
+    User.repository.select(User.age.is_in((32, 33)))
+    User.repository.select(User.name == "Vincent")
+    db.logging = False
+    plans = [
+        " ".join(
+            row[-1]
+            for row in db.connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+        )
+        for statement, parameters in statements
+    ]
+    assert "USING INDEX idx_age" in plans[0]
+    assert "USING INDEX idx_age" in plans[1]
+    assert "USING INDEX idx_name" in plans[2]
+
+
+def test_create_and_select_iter(db):
+    """Create users and iterate over them in small batches."""
+    db.bind({User})
+    users = [
+        User.repository.create(name=f"user{i}", age=20 + i, height=5.7)
+        for i in range(5)
+    ]
+    db.cache.clear()
+
+    # Iterate over users, fetching two rows at a time.
+    result = db.select_iter(User, User.age > 21, batch_size=2)
+    names = sorted(user.name for user in result)
+    assert names == [user.name for user in users[2:]]
+    assert list(User.repository.select_iter(User.age > 30)) == []
+
+
+def test_get_many(db):
+    """Create users and retrieve some of them in a single call."""
+    db.bind({User})
+    user1 = User.repository.create(name="Vincent", age=33, height=5.7)
+    user2 = User.repository.create(name="Muriel", age=32, height=5.6)
+    ids = (user1.id, user2.id)
+
+    # Keep user1 in cache, user2 will be selected.
+    db.cache.clear()
+    db.cache_instance(user1)
+    users = User.repository.get_many([ids[1], 999, ids[0], ids[1]])
+    assert users[0].name == "Muriel"
+    assert users[1] is None
+    assert users[2] is user1
+    assert users[3] is users[0]
+
+
 def test_create_and_bulk_delete_is_in(db):
     """Create users and search in the storage through queries."""
     db.bind({User})
@@ -274,7 +390,8 @@ def test_create_and_bulk_delete_is_in(db):
     # Don't clear the cache, check that user1 and user2 have been removed.
     assert User.repository.get(id=user1.id) is None
     assert User.repository.get(id=user2.id) is None
-    assert User.repository.get(id=user3.id)
+    assert User.repository.get(email="muriel@test.com") is None
+    assert User.repository.get(id=user3.id) is user3
 
 
 def test_create_and_bulk_delete_is_in_no_cache(db):
@@ -346,6 +463,58 @@ def test_update_and_retrieve_with_a_clean_cache(db):
     assert user.email == retrieved.email
 
 
+def test_update_fields_and_retrieve_with_a_clean_cache(db):
+    """Update several fields of a user with a single query."""
+    db.bind({User})
+    user = User.repository.create(name="Vincent", age=33, height=5.7)
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(statement)
+    User.repository.update_fields(user, age=21, email="vincent@test.com")
+    assert len(statements) == 1
+    assert user.age == 21
+    assert user.email == "vincent@test.com"
+
+    # Clear the cache and retrieve the same user.
+    db.cache.clear()
+    retrieved = User.repository.get(id=user.id)
+    assert retrieved.age == 21
+    assert retrieved.email == "vincent@test.com"
+    assert retrieved.name == "Vincent"
+
+
+def test_update_fields_leaves_the_user_unchanged_on_failure(db):
+    """Update fields with an email already taken."""
+    db.bind({User})
+    User.repository.create(
+        name="Vincent", age=33, height=5.7, email="vincent@test.com"
+    )
+    user = User.repository.create(name="Alice", age=27, height=5.3)
+    with pytest.raises(IntegrityError):
+        User.repository.update_fields(
+            user, age=21, email="vincent@test.com"
+        )
+    assert user.age == 27
+    assert user.email is None
+
+    # Clear the cache and retrieve the same user.
+    db.cache.clear()
+    retrieved = User.repository.get(id=user.id)
+    assert retrieved.age == 27
+    assert retrieved.email is None
+
+
+def test_update_fields_with_an_unknown_field(db):
+    """Update fields that don't exist on the model."""
+    db.bind({User})
+    user = User.repository.create(name="Vincent", age=33, height=5.7)
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(statement)
+    with pytest.raises(ValueError):
+        User.repository.update_fields(user, age=21, nickname="vince")
+    assert statements == []
+    assert user.age == 33
+
+
 def test_delete(db):
     """Create and delete a user."""
     db.bind({User})
@@ -367,3 +536,31 @@ def test_delete_and_retrieve_from_engine(db):
     # Fetching the same user won't retrieve anything.
     retrieved = User.repository.get(id=user.id)
     assert retrieved is None
+
+
+def test_bind_again(db):
+    """Binding models already bound doesn't query the storage."""
+    db.bind({User})
+    statements = []
+    db.logging = lambda statement, parameters: statements.append(statement)
+    db.bind({User})
+    assert statements == []
+    user = User.repository.create(name="Vincent", age=33, height=5.7)
+    assert User.repository.get(id=user.id) is user
+
+
+def test_compare_and_hash(db):
+    """Users are compared and hashed on their primary key."""
+    db.bind({User})
+    user1 = User.repository.create(name="Vincent", age=33, height=5.7)
+    user2 = User.repository.create(name="Vincent", age=33, height=5.7)
+    assert user1 == user1
+    assert user1 != user2
+    assert {user1, user2, user1} == {user1, user2}
+
+    # A copy read from the storage is equal, even if it's not cached.
+    db.cache.clear()
+    copy = User.repository.get(id=user1.id)
+    assert copy is not user1
+    assert copy == user1
+    assert hash(copy) == hash(user1)
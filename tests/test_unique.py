@@ -19,3 +19,16 @@ def test_create_and_get(db):
     # Check the field.
     assert User.repository.get(name="Vincent") is vincent
     assert User.repository.get(name="Mark") is mark
+
+
+def test_create_and_get_from_storage(db):
+    """Create users and get them by unique field, with a clean cache."""
+    db.bind({User})
+    User.repository.create(name="Vincent", age=33)
+    User.repository.create(name="Mark", age=28)
+
+    # Clear the cache and retrieve them.
+    db.cache.clear()
+    assert User.repository.get(name="Vincent").age == 33
+    assert User.repository.get(name="Mark").age == 28
+    assert User.repository.get(name="Nobody") is None
@@ -123,3 +123,37 @@ def test_create_uuid_pk_and_delete_it(db):
 
     # Delete it.
     Session.repository.delete(session)
+
+
+def test_get_many_pk_uuid(db):
+    """Create sessions and retrieve them in a single call."""
+    db.bind({Session})
+    first = Session.repository.create(id=uuid4(), name="first")
+    second = Session.repository.create(id=uuid4(), name="second")
+    first_id, second_id = first.id, second.id
+
+    # Clear the cache.
+    db.cache.clear()
+    del first, second
+
+    # Retrieve them, with an unknown UUID in between.
+    sessions = Session.repository.get_many([second_id, uuid4(), first_id])
+    assert [session and session.name for session in sessions] == [
+        "second",
+        None,
+        "first",
+    ]
+    assert sessions[2].id == first_id
+
+
+def test_select_pk_uuid(db):
+    """Create sessions and select one by UUID."""
+    db.bind({Session})
+    generated = uuid4()
+    Session.repository.create(id=generated, name="first")
+    Session.repository.create(id=uuid4(), name="second")
+
+    # Clear the cache and select by UUID.
+    db.cache.clear()
+    sessions = Session.repository.select(Session.id == generated)
+    assert [session.name for session in sessions] == ["first"]